@@ -1,13 +1,26 @@
+import os
+from itertools import chain
+
 import torch
 from datasets import load_dataset
-from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, TrainingArguments
-from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    BitsAndBytesConfig,
+    DataCollatorForSeq2Seq,
+    TrainingArguments,
+)
+from transformers.utils import is_flash_attn_2_available
+from peft import LoraConfig, PeftModel, get_peft_model, prepare_model_for_kbit_training
 from trl import SFTTrainer
 
 # 1. Configuration
 model_id = "meta-llama/Meta-Llama-3-8B" # The base model you want to fine-tune
 dataset_path = "./example-dataset.json"          # Your local dataset file
 output_dir = "./llama3-8b-finetuned-adapters" # Where to save the trained LoRA adapters
+max_seq_length = 1024                         # Length of each packed training window
+merge_adapters = True                         # Fold the adapters into the base weights after training
+merged_output_dir = "./llama3-8b-finetuned-merged" # Where to save the merged checkpoint
 
 # 2. Load the Dataset
 dataset = load_dataset("json", data_files=dataset_path, split="train")
@@ -21,25 +34,59 @@ bnb_config = BitsAndBytesConfig(
 )
 
 tokenizer = AutoTokenizer.from_pretrained(model_id)
-# Important: Add a padding token if the base model doesn't have one
+# Important: Reuse EOS for padding if the base model doesn't have a pad token.
+# Adding a new token would resize the (quantized) embedding layer.
 if tokenizer.pad_token is None:
-    tokenizer.add_special_tokens({'pad_token': '[PAD]'})
+    tokenizer.pad_token = tokenizer.eos_token
+tokenizer.padding_side = "left" # Decoder-only models expect left padding
+
+# Tokenize once up front and pack examples back-to-back into max_seq_length
+# windows, so training steps neither re-tokenize nor spend FLOPs on padding.
+def tokenize(batch):
+    return tokenizer([text + tokenizer.eos_token for text in batch["output"]])
+
+def pack(batch):
+    input_ids = list(chain.from_iterable(batch["input_ids"]))
+    windows = [input_ids[i:i + max_seq_length] for i in range(0, len(input_ids), max_seq_length)]
+    return {
+        "input_ids": windows,
+        "attention_mask": [[1] * len(window) for window in windows],
+        "labels": [list(window) for window in windows],
+    }
+
+num_proc = min(os.cpu_count() or 1, len(dataset))
+dataset = dataset.map(tokenize, batched=True, num_proc=num_proc, remove_columns=dataset.column_names)
+# Pack the whole dataset as one batch in one process; every extra batch or shard would
+# leave its own short, padded tail window.
+dataset = dataset.map(pack, batched=True, batch_size=None, remove_columns=dataset.column_names)
+
+# Prefer fused Flash Attention 2 kernels, falling back to PyTorch SDPA
+attn_implementation = "flash_attention_2" if is_flash_attn_2_available() else "sdpa"
 
 model = AutoModelForCausalLM.from_pretrained(
     model_id,
     quantization_config=bnb_config,
-    device_map="auto" # Let accelerate handle GPU placement
+    device_map="auto", # Let accelerate handle GPU placement
+    attn_implementation=attn_implementation,
+    torch_dtype=torch.bfloat16,
 )
+model.config.use_cache = False # The KV cache is unused with gradient checkpointing
 
 # 4. PEFT (LoRA) Configuration
-# Prepare the model for k-bit training
-model = prepare_model_for_kbit_training(model)
+# Prepare the model for k-bit training (this also enables gradient checkpointing)
+model = prepare_model_for_kbit_training(
+    model, gradient_checkpointing_kwargs={"use_reentrant": False}
+)
+model.enable_input_require_grads()
 
 # Define the LoRA configuration
 lora_config = LoraConfig(
     r=16, # Rank of the update matrices. Higher rank means more parameters to train.
     lora_alpha=32, # LoRA scaling factor.
-    target_modules=["q_proj", "k_proj", "v_proj", "o_proj"], # Apply LoRA to attention layers
+    target_modules=[ # Apply LoRA to all linear layers (attention + MLP)
+        "q_proj", "k_proj", "v_proj", "o_proj",
+        "gate_proj", "up_proj", "down_proj",
+    ],
     lora_dropout=0.05,
     bias="none",
     task_type="CAUSAL_LM"
@@ -57,16 +104,21 @@ training_args = TrainingArguments(
     num_train_epochs=3,
     logging_steps=10,
     save_strategy="epoch",
-    fp16=True, # Use fp16 for training
+    bf16=True, # Match the bfloat16 compute dtype of the 4-bit weights
+    fp16=False,
+    gradient_checkpointing=True,
+    gradient_checkpointing_kwargs={"use_reentrant": False},
+    optim="paged_adamw_8bit", # Paged 8-bit optimizer states absorb memory spikes
 )
 
 # 6. Initialize the Trainer
 trainer = SFTTrainer(
     model=model,
-    train_dataset=dataset,
+    train_dataset=dataset, # Already tokenized and packed from the 'output' field
     peft_config=lora_config,
-    dataset_text_field="output", # Assuming the 'output' field contains the text to learn
-    max_seq_length=1024,
+    dataset_kwargs={"skip_prepare_dataset": True},
+    data_collator=DataCollatorForSeq2Seq(tokenizer, label_pad_token_id=-100), # Pads the final partial window
+    max_seq_length=max_seq_length,
     tokenizer=tokenizer,
     args=training_args,
 )
@@ -77,3 +129,22 @@ trainer.train()
 # 8. Save the final adapters
 trainer.save_model(output_dir)
 print(f"LoRA adapters saved to {output_dir}")
+
+# 9. Merge the adapters for GGUF conversion
+# Folding B@A into the base weights removes the per-forward LoRA matmuls and the
+# 4-bit dequantization of an adapter-attached model. The merged checkpoint is saved
+# in bf16 on purpose: it is the input for llama.cpp's convert_hf_to_gguf.py and
+# GGUF quantization, which is what the API serves. It is not re-quantized to
+# bitsandbytes NF4, since nothing here runs bnb inference.
+if merge_adapters:
+    del trainer, model
+    torch.cuda.empty_cache()
+    base_model = AutoModelForCausalLM.from_pretrained(
+        model_id,
+        torch_dtype=torch.bfloat16,
+        device_map="auto",
+    )
+    merged_model = PeftModel.from_pretrained(base_model, output_dir).merge_and_unload()
+    merged_model.save_pretrained(merged_output_dir, safe_serialization=True)
+    tokenizer.save_pretrained(merged_output_dir)
+    print(f"Merged bf16 model saved to {merged_output_dir}; convert it to GGUF for the API")
@@ -0,0 +1,40 @@
+"""Shared FastAPI dependencies for resolving application services."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+from starlette.requests import HTTPConnection
+
+from app.services.conversation import ConversationService
+from app.services.llm import LLMService
+from app.services.llm_scheduler import LLMScheduler
+from app.services.openaudio import OpenAudioService
+from app.services.whisper import WhisperService
+
+
+@dataclass(frozen=True, slots=True)
+class Services:
+    """Service instances resolved once during application startup."""
+
+    llm: LLMService
+    llm_scheduler: LLMScheduler
+    whisper: WhisperService
+    openaudio: OpenAudioService
+    conversation: ConversationService
+
+
+def services_from_connection(connection: HTTPConnection) -> Services | None:
+    """Return the service container for an HTTP request or WebSocket, if started."""
+
+    return getattr(connection.app.state, "services", None)
+
+
+def get_services(request: Request) -> Services:
+    """Dependency returning the application service container."""
+
+    services = services_from_connection(request)
+    if services is None:
+        raise HTTPException(status_code=503, detail="Services are not available")
+    return services
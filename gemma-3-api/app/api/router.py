@@ -1,11 +1,26 @@
 """Root API router wiring."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.v1 import generation, speech
+from app.config.settings import Settings
+from app.security import enforce_rate_limit, require_api_key
 
 
-api_router = APIRouter()
-api_router.include_router(generation.router, prefix="/v1")
-api_router.include_router(speech.router, prefix="/v1")
+def build_api_router(settings: Settings) -> APIRouter:
+    """Return the v1 API router guarded by the checks ``settings`` enables.
 
+    Disabled guards are left off entirely rather than short-circuiting per
+    request, so FastAPI does not resolve them for every call.
+    """
+
+    dependencies = []
+    if settings.api_key_enabled:
+        dependencies.append(Depends(require_api_key))
+    if settings.rate_limit_enabled:
+        dependencies.append(Depends(enforce_rate_limit))
+
+    api_router = APIRouter()
+    api_router.include_router(generation.router, prefix="/v1", dependencies=dependencies)
+    api_router.include_router(speech.router, prefix="/v1", dependencies=dependencies)
+    return api_router
@@ -2,87 +2,135 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import Dict, Iterable
+from typing import AsyncIterator, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 
+from app.api.dependencies import Services, get_services, services_from_connection
 from app.schemas.generation import (
+    BatchTokenizeRequest,
+    BatchTokenizeResponse,
     GenerationRequest,
     GenerationResponse,
+    generation_request_decoder,
     ModelInfo,
     ModelListResponse,
 )
-from app.services.llm import LLMService
-from app.security import (
-    enforce_rate_limit,
-    enforce_websocket_api_key,
-    enforce_websocket_rate_limit,
-    require_api_key,
-)
+from app.security import enforce_websocket_api_key, enforce_websocket_rate_limit
+from app.utils.json import dumps, dumps_line, dumps_sse
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(
-    tags=["generation"],
-    dependencies=[Depends(require_api_key), Depends(enforce_rate_limit)],
-)
+# The HTTP guards (API key, rate limit) are attached in ``app.api.router`` when enabled.
+router = APIRouter(tags=["generation"])
 
+_MODEL_CATALOGUE = (
+    ModelInfo(
+        id="google/gemma-3-12b-it-qat-q4_0-gguf",
+        name="Gemma 3 12B Q4_0 GGUF",
+        description="Google's Gemma 3 model, 12B parameters, quantized to 4-bit.",
+    ),
+)
+# The catalogue is static, so its JSON is rendered once instead of per request.
+_MODEL_LIST_JSON = dumps(ModelListResponse(models=list(_MODEL_CATALOGUE)).model_dump())
+_MODEL_INFO_JSON = {model.id: dumps(model.model_dump()) for model in _MODEL_CATALOGUE}
 
-def _get_llm_service(request: Request) -> LLMService:
-    service: LLMService | None = getattr(request.app.state, "llm_service", None)
-    if service is None:
-        raise HTTPException(status_code=503, detail="Model is not available")
-    return service
+_WS_STATUS_DONE_FRAME = dumps({"status": "done"})
 
 
 @router.post("/generate", response_model=GenerationResponse)
 async def generate_text(
     payload: GenerationRequest,
-    llm_service: LLMService = Depends(_get_llm_service),
+    services: Services = Depends(get_services),
 ) -> GenerationResponse:
     """Synchronous text generation endpoint."""
 
-    logger.info("Generating text for prompt: '%s...'", payload.prompt[:50])
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Generating text for prompt: '%s...'", payload.prompt[:50])
 
-    generation_params = payload.model_dump(exclude_unset=True)
+    generation_params = payload.to_llama_kwargs()
+    sequence = services.llm_scheduler.submit(generation_params)
     try:
-        output = llm_service.model(**generation_params)
+        result_text = await sequence.text()
     except Exception as exc:  # pragma: no cover - llama.cpp errors
         logger.exception("Error during text generation")
         raise HTTPException(status_code=500, detail="Failed to generate text.") from exc
+    finally:
+        sequence.cancel()
 
-    result_text = output["choices"][0]["text"]
     return GenerationResponse(generated_text=result_text)
 
 
 @router.post("/generate_stream")
 async def generate_text_stream(
     payload: GenerationRequest,
-    llm_service: LLMService = Depends(_get_llm_service),
+    services: Services = Depends(get_services),
+    accept: str | None = Header(default=None),
 ) -> StreamingResponse:
-    """Stream partial generations as newline-delimited JSON."""
+    """Stream partial generations as newline-delimited JSON.
 
-    logger.info("Generating text stream for prompt: '%s...'", payload.prompt[:50])
+    Each line carries only the newly generated text, ``{"i": <index>, "delta": "..."}``;
+    clients concatenate the deltas in order to rebuild the full completion. Clients
+    sending ``Accept: text/event-stream`` receive the same objects as SSE ``data:`` frames.
+    """
 
-    generation_params = payload.model_dump(exclude_unset=True)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Generating text stream for prompt: '%s...'", payload.prompt[:50])
 
-    def event_stream() -> Iterable[str]:
-        aggregated_text = ""
+    generation_params = payload.to_llama_kwargs()
+    scheduler = services.llm_scheduler
+    use_sse = accept is not None and "text/event-stream" in accept
+    encode = dumps_sse if use_sse else dumps_line
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        index = 0
+        sequence = scheduler.submit(generation_params)
         try:
-            for chunk in llm_service.model(**generation_params, stream=True):
-                token = chunk["choices"][0]["text"]
-                aggregated_text += token
-                yield json.dumps({"generated_text": aggregated_text}) + "\n"
+            # Tokens are flushed in small batches to cut per-chunk framing and writes.
+            async for tokens in sequence.batches():
+                yield encode({"i": index, "delta": "".join(tokens)})
+                index += 1
         except Exception as exc:  # pragma: no cover - llama.cpp errors
             logger.exception("Error during streaming generation")
             error_payload: Dict[str, str] = {"detail": "Failed to generate text stream."}
-            yield json.dumps(error_payload) + "\n"
+            yield encode(error_payload)
             return
+        finally:
+            sequence.cancel()
+
+    media_type = "text/event-stream" if use_sse else "application/json"
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+
+@router.post("/batch/tokenize", response_model=BatchTokenizeResponse)
+async def batch_tokenize(
+    payload: BatchTokenizeRequest,
+    services: Services = Depends(get_services),
+) -> BatchTokenizeResponse:
+    """Tokenize a list of prompts with one worker-thread hop for the whole batch."""
 
-    return StreamingResponse(event_stream(), media_type="application/json")
+    try:
+        tokens = await asyncio.to_thread(
+            services.llm.tokenize_batch, payload.inputs, add_bos=payload.add_bos
+        )
+    except Exception as exc:  # pragma: no cover - llama.cpp errors
+        logger.exception("Error during batch tokenization")
+        raise HTTPException(status_code=500, detail="Failed to tokenize inputs.") from exc
+
+    return BatchTokenizeResponse(tokens=tokens)
+
+
+async def _receive_raw(websocket: WebSocket) -> bytes | str:
+    """Return the raw payload of the next text or binary WebSocket message."""
+
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    raw = message.get("bytes")
+    return raw if raw is not None else message["text"]
 
 
 @router.websocket("/generate_ws")
@@ -94,22 +142,26 @@ async def generate_ws(websocket: WebSocket) -> None:
     await websocket.accept()
 
     try:
-        llm_service: LLMService | None = getattr(websocket.app.state, "llm_service", None)
-        if llm_service is None:
+        services = services_from_connection(websocket)
+        if services is None:
             await websocket.close(code=1011, reason="Model is not available")
             return
+        scheduler = services.llm_scheduler
         while True:
-            data = await websocket.receive_json()
-            payload = GenerationRequest(**data)
+            payload = generation_request_decoder.decode(await _receive_raw(websocket))
 
-            logger.info("Generating text stream for prompt: '%s...'", payload.prompt[:50])
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Generating text stream for prompt: '%s...'", payload.prompt[:50])
 
-            generation_params = payload.model_dump(exclude_unset=True)
-            for chunk in llm_service.model(**generation_params, stream=True):
-                token = chunk["choices"][0]["text"]
-                await websocket.send_json({"token": token})
+            generation_params = payload.to_llama_kwargs()
+            sequence = scheduler.submit(generation_params)
+            try:
+                async for tokens in sequence.batches():
+                    await websocket.send_bytes(dumps({"delta": "".join(tokens)}))
+            finally:
+                sequence.cancel()
 
-            await websocket.send_json({"status": "done"})
+            await websocket.send_bytes(_WS_STATUS_DONE_FRAME)
 
     except WebSocketDisconnect:
         logger.info("Client disconnected from WebSocket.")
@@ -118,29 +170,17 @@ async def generate_ws(websocket: WebSocket) -> None:
         await websocket.close(code=1011, reason="An internal error occurred.")
 
 
-@router.get("/models", response_model=ModelListResponse)
-async def list_models() -> ModelListResponse:
+@router.get("/models", responses={200: {"model": ModelListResponse}})
+async def list_models() -> Response:
     """List available LLM checkpoints."""
 
-    return ModelListResponse(
-        models=[
-            ModelInfo(
-                id="google/gemma-3-12b-it-qat-q4_0-gguf",
-                name="Gemma 3 12B Q4_0 GGUF",
-                description="Google's Gemma 3 model, 12B parameters, quantized to 4-bit.",
-            )
-        ]
-    )
+    return Response(_MODEL_LIST_JSON, media_type="application/json")
 
 
-@router.get("/models/{model_id}", response_model=ModelInfo)
-async def get_model_info(model_id: str) -> ModelInfo:
-    if model_id != "google/gemma-3-12b-it-qat-q4_0-gguf":
+@router.get("/models/{model_id}", responses={200: {"model": ModelInfo}})
+async def get_model_info(model_id: str) -> Response:
+    payload = _MODEL_INFO_JSON.get(model_id)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Model not found.")
 
-    return ModelInfo(
-        id=model_id,
-        name="Gemma 3 12B Q4_0 GGUF",
-        description="Google's Gemma 3 model, 12B parameters, quantized to 4-bit.",
-    )
-
+    return Response(payload, media_type="application/json")
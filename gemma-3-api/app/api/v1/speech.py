@@ -2,24 +2,24 @@
 
 from __future__ import annotations
 
-import base64
-import json
 import logging
+import struct
 from typing import Any, AsyncIterator, Dict
 
+import msgspec
 from fastapi import (
     APIRouter,
     Depends,
     File,
     Form,
     HTTPException,
-    Request,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
 )
 from fastapi.responses import StreamingResponse
 
+from app.api.dependencies import Services, get_services, services_from_connection
 from app.schemas.speech import (
     SpeechDialogueResponse,
     SpeechSynthesisRequest,
@@ -27,22 +27,40 @@ from app.schemas.speech import (
     SpeechTranscriptionResponse,
     SpeechTranscriptionSegment,
 )
-from app.services.conversation import ConversationService, DialogueStreamResult
+from app.services.conversation import DialogueStreamResult
 from app.services.openaudio import OpenAudioService
 from app.services.whisper import WhisperService, WhisperTranscription
-from app.security import (
-    enforce_rate_limit,
-    enforce_websocket_api_key,
-    enforce_websocket_rate_limit,
-    require_api_key,
-)
+from app.security import enforce_websocket_api_key, enforce_websocket_rate_limit
+from app.utils.b64 import b64decode
+from app.utils.json import dumps
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(
-    tags=["speech"],
-    dependencies=[Depends(require_api_key), Depends(enforce_rate_limit)],
-)
+# The HTTP guards (API key, rate limit) are attached in ``app.api.router`` when enabled.
+router = APIRouter(tags=["speech"])
+
+# Streaming dialogue frames: 1-byte kind + little-endian uint32 length, then the payload.
+_FRAME_HEADER = struct.Struct("<BI")
+FRAME_JSON = 0
+FRAME_AUDIO = 1
+
+
+def _frame_header(kind: int, length: int) -> bytes:
+    return _FRAME_HEADER.pack(kind, length)
+
+
+def _json_frame(value: Any) -> bytes:
+    payload = dumps(value)
+    return _frame_header(FRAME_JSON, len(payload)) + payload
+
+
+# Fixed-shape events are encoded once; per-chunk work only formats the length.
+_DIALOGUE_DONE_FRAME = _json_frame({"event": "done"})
+_WS_DONE_TEXT = dumps({"event": "done"}).decode()
+_WS_AUDIO_CHUNK_PREFIX = '{"event":"audio_chunk","len":'
+
+
+_JSON_OBJECT_DECODER = msgspec.json.Decoder(Dict[str, Any])
 
 
 def _parse_json_field(raw_value: str | None, field_name: str) -> Dict[str, Any]:
@@ -51,19 +69,19 @@ def _parse_json_field(raw_value: str | None, field_name: str) -> Dict[str, Any]:
     if raw_value in (None, "", "null"):
         return {}
     try:
-        parsed = json.loads(raw_value)
-    except json.JSONDecodeError as exc:
+        return _JSON_OBJECT_DECODER.decode(raw_value)
+    except msgspec.ValidationError as exc:
+        raise HTTPException(status_code=400, detail=f"Field '{field_name}' must be a JSON object") from exc
+    except msgspec.DecodeError as exc:
         raise HTTPException(status_code=400, detail=f"Invalid JSON for '{field_name}'") from exc
-    if not isinstance(parsed, dict):
-        raise HTTPException(status_code=400, detail=f"Field '{field_name}' must be a JSON object")
-    return parsed
 
 
 def _build_transcription_model(
     transcription: WhisperTranscription,
 ) -> SpeechTranscriptionResponse:
+    # Values come from the trusted Whisper dataclasses, so validation is skipped.
     segments = [
-        SpeechTranscriptionSegment(
+        SpeechTranscriptionSegment.model_construct(
             id=segment.id,
             start=segment.start,
             end=segment.end,
@@ -71,32 +89,35 @@ def _build_transcription_model(
         )
         for segment in transcription.segments
     ]
-    return SpeechTranscriptionResponse(
+    return SpeechTranscriptionResponse.model_construct(
         text=transcription.text,
         language=transcription.language,
         segments=segments,
     )
 
 
-def _get_whisper_service(request: Request) -> WhisperService:
-    service: WhisperService | None = getattr(request.app.state, "whisper_service", None)
-    if service is None or not service.is_ready:
-        raise HTTPException(status_code=503, detail="Whisper service is unavailable")
-    return service
+def _upload_size(file: UploadFile) -> int:
+    """Return the size of a spooled upload without reading it into memory."""
 
+    if file.size is not None:
+        return file.size
+    position = file.file.tell()
+    file.file.seek(0, 2)
+    size = file.file.tell()
+    file.file.seek(position)
+    return size
 
-def _get_openaudio_service(request: Request) -> OpenAudioService:
-    service: OpenAudioService | None = getattr(request.app.state, "openaudio_service", None)
-    if service is None or not service.is_ready:
-        raise HTTPException(status_code=503, detail="OpenAudio service is unavailable")
-    return service
+
+def _ready_whisper(services: Services) -> WhisperService:
+    if not services.whisper.is_ready:
+        raise HTTPException(status_code=503, detail="Whisper service is unavailable")
+    return services.whisper
 
 
-def _get_conversation_service(request: Request) -> ConversationService:
-    service: ConversationService | None = getattr(request.app.state, "conversation_service", None)
-    if service is None:
-        raise HTTPException(status_code=503, detail="Conversation service is unavailable")
-    return service
+def _ready_openaudio(services: Services) -> OpenAudioService:
+    if not services.openaudio.is_ready:
+        raise HTTPException(status_code=503, detail="OpenAudio service is unavailable")
+    return services.openaudio
 
 
 @router.post(
@@ -110,18 +131,22 @@ async def speech_to_text(
     prompt: str | None = Form(default=None, description="Optional priming prompt."),
     response_format: str | None = Form(default=None, description="Override Whisper response format."),
     temperature: float | None = Form(default=None, description="Sampling temperature."),
-    whisper_service: WhisperService = Depends(_get_whisper_service),
+    services: Services = Depends(get_services),
 ) -> SpeechTranscriptionResponse:
     """Run Whisper on the provided audio payload."""
 
-    audio_bytes = await file.read()
-    if not audio_bytes:
+    whisper_service = _ready_whisper(services)
+
+    audio_size = _upload_size(file)
+    if not audio_size:
         raise HTTPException(status_code=400, detail="Uploaded audio file was empty")
 
-    logger.info("Transcribing audio file '%s' (%s bytes)", file.filename, len(audio_bytes))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Transcribing audio file '%s' (%s bytes)", file.filename, audio_size)
 
+    await file.seek(0)
     transcription = await whisper_service.transcribe(
-        audio_bytes,
+        file.file,
         filename=file.filename or "audio.wav",
         content_type=file.content_type,
         language=language,
@@ -130,21 +155,7 @@ async def speech_to_text(
         temperature=temperature,
     )
 
-    segments = [
-        SpeechTranscriptionSegment(
-            id=segment.id,
-            start=segment.start,
-            end=segment.end,
-            text=segment.text,
-        )
-        for segment in transcription.segments
-    ]
-
-    return SpeechTranscriptionResponse(
-        text=transcription.text,
-        language=transcription.language,
-        segments=segments,
-    )
+    return _build_transcription_model(transcription)
 
 
 @router.post(
@@ -158,10 +169,12 @@ async def speech_to_text(
 )
 async def text_to_speech(
     payload: SpeechSynthesisRequest,
-    openaudio_service: OpenAudioService = Depends(_get_openaudio_service),
+    services: Services = Depends(get_services),
 ):
     """Generate speech audio from text."""
 
+    openaudio_service = _ready_openaudio(services)
+
     if payload.stream:
         stream_result = await openaudio_service.synthesize_stream(
             text=payload.text,
@@ -225,22 +238,22 @@ async def dialogue(
     ),
     stream_audio: bool = Form(
         default=False,
-        description="When true, stream newline-delimited JSON events with audio chunks.",
+        description="When true, stream length-prefixed JSON event and raw audio frames.",
     ),
-    conversation_service: ConversationService = Depends(_get_conversation_service),
+    services: Services = Depends(get_services),
 ):
     """Process uploaded audio and return both transcript and synthesised reply."""
 
-    audio_bytes = await file.read()
-    if not audio_bytes:
+    if not _upload_size(file):
         raise HTTPException(status_code=400, detail="Uploaded audio file was empty")
 
     generation_overrides = _parse_json_field(generation_config, "generation_config")
     synthesis_overrides = _parse_json_field(synthesis_config, "synthesis_config")
 
     try:
-        result = await conversation_service.run_dialogue(
-            audio_bytes=audio_bytes,
+        await file.seek(0)
+        result = await services.conversation.run_dialogue(
+            audio_bytes=file.file,
             filename=file.filename or "audio.wav",
             content_type=file.content_type,
             instructions=instructions,
@@ -261,7 +274,7 @@ async def dialogue(
 
     if isinstance(result, DialogueStreamResult):
 
-        async def dialogue_stream() -> AsyncIterator[str]:
+        async def dialogue_stream() -> AsyncIterator[bytes]:
             metadata = {
                 "response_format": result.synthesis_stream.response_format,
                 "media_type": result.synthesis_stream.media_type,
@@ -269,19 +282,18 @@ async def dialogue(
             }
             if result.synthesis_stream.reference_id is not None:
                 metadata["reference_id"] = result.synthesis_stream.reference_id
-            yield json.dumps({"event": "metadata", "data": metadata}) + "\n"
-            yield json.dumps({"event": "transcript", "data": transcript_model.model_dump()}) + "\n"
-            yield json.dumps(
-                {"event": "assistant_text", "data": {"text": result.response_text}}
-            ) + "\n"
+            yield _json_frame({"event": "metadata", "data": metadata})
+            yield _json_frame({"event": "transcript", "data": transcript_model.model_dump()})
+            yield _json_frame({"event": "assistant_text", "data": {"text": result.response_text}})
             async for chunk in result.synthesis_stream.iterator_factory():
                 if not chunk:
                     continue
-                encoded = base64.b64encode(chunk).decode("ascii")
-                yield json.dumps({"event": "audio_chunk", "data": {"audio_base64": encoded}}) + "\n"
-            yield json.dumps({"event": "done"}) + "\n"
+                # Header and raw audio go out as separate body chunks to avoid copying audio.
+                yield _frame_header(FRAME_AUDIO, len(chunk))
+                yield chunk
+            yield _DIALOGUE_DONE_FRAME
 
-        return StreamingResponse(dialogue_stream(), media_type="application/json")
+        return StreamingResponse(dialogue_stream(), media_type="application/octet-stream")
 
     synthesis = result.synthesis
     return SpeechDialogueResponse(
@@ -303,7 +315,8 @@ async def speech_to_text_ws(websocket: WebSocket) -> None:
         return
     await websocket.accept()
 
-    whisper_service: WhisperService | None = getattr(websocket.app.state, "whisper_service", None)
+    services = services_from_connection(websocket)
+    whisper_service = services.whisper if services is not None else None
     if whisper_service is None or not whisper_service.is_ready:
         await websocket.close(code=1013, reason="Whisper service is unavailable")
         return
@@ -316,7 +329,7 @@ async def speech_to_text_ws(websocket: WebSocket) -> None:
                 await websocket.send_json({"event": "error", "detail": "Missing 'audio_base64' field."})
                 continue
             try:
-                audio_bytes = base64.b64decode(audio_base64)
+                audio_bytes = b64decode(audio_base64)
             except (ValueError, TypeError):
                 await websocket.send_json(
                     {"event": "error", "detail": "Invalid base64 data supplied for 'audio_base64'."}
@@ -356,9 +369,8 @@ async def text_to_speech_ws(websocket: WebSocket) -> None:
         return
     await websocket.accept()
 
-    openaudio_service: OpenAudioService | None = getattr(
-        websocket.app.state, "openaudio_service", None
-    )
+    services = services_from_connection(websocket)
+    openaudio_service = services.openaudio if services is not None else None
     if openaudio_service is None or not openaudio_service.is_ready:
         await websocket.close(code=1013, reason="OpenAudio service is unavailable")
         return
@@ -399,11 +411,9 @@ async def text_to_speech_ws(websocket: WebSocket) -> None:
                     async for chunk in stream_result.iterator_factory():
                         if not chunk:
                             continue
-                        encoded = base64.b64encode(chunk).decode("ascii")
-                        await websocket.send_json(
-                            {"event": "audio_chunk", "data": {"audio_base64": encoded}}
-                        )
-                    await websocket.send_json({"event": "done"})
+                        await websocket.send_text(f"{_WS_AUDIO_CHUNK_PREFIX}{len(chunk)}}}")
+                        await websocket.send_bytes(chunk)
+                    await websocket.send_text(_WS_DONE_TEXT)
                 else:
                     synthesis = await openaudio_service.synthesize(text=text, **synthesis_kwargs)
                     synthesis_payload = {
@@ -414,8 +424,9 @@ async def text_to_speech_ws(websocket: WebSocket) -> None:
                     }
                     if synthesis.reference_id is not None:
                         synthesis_payload["reference_id"] = synthesis.reference_id
-                    await websocket.send_json(
-                        {"event": "synthesis", "data": synthesis_payload}
+                    # orjson handles the large base64 string far faster than send_json's encoder.
+                    await websocket.send_text(
+                        dumps({"event": "synthesis", "data": synthesis_payload}).decode()
                     )
             except RuntimeError:
                 await websocket.send_json(
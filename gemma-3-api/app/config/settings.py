@@ -1,208 +1,380 @@
 """Application configuration and environment management."""
 
-from functools import lru_cache
-from typing import Optional
+from __future__ import annotations
 
-from pydantic import Field, PositiveFloat, PositiveInt, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+import re
+from pathlib import Path
+from typing import Annotated, Any, Dict, Literal, Mapping, Optional, get_type_hints
 
+import msgspec
+from msgspec import Meta
 
-class Settings(BaseSettings):
+PositiveInt = Annotated[int, Meta(gt=0)]
+PositiveFloat = Annotated[float, Meta(gt=0)]
+
+# ``KEY=value`` lines as written by docker/compose style ``.env`` files.
+_DOTENV_LINE = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$")
+
+
+def _read_dotenv(path: Path) -> Dict[str, str]:
+    """Parse a ``.env`` file, returning an empty mapping when it does not exist."""
+
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return {}
+
+    values: Dict[str, str] = {}
+    for line in lines:
+        match = _DOTENV_LINE.match(line)
+        if match is None or line.lstrip().startswith("#"):
+            continue
+        key, value = match.groups()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key] = value
+    return values
+
+
+def _split_list(value: str) -> frozenset[str]:
+    """Accept either a JSON array or a comma separated string."""
+
+    if value.lstrip().startswith("["):
+        return msgspec.json.decode(value, type=frozenset[str])
+    return frozenset(item.strip() for item in value.split(",") if item.strip())
+
+
+# Fields read from a comma separated string or JSON array rather than a scalar.
+_LIST_FIELDS = ("api_keys", "observability_exclude_paths")
+
+# Boolean spellings accepted from the environment (compared case-insensitively), matching
+# what the earlier pydantic-settings configuration understood.
+_TRUE_STRINGS = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_STRINGS = frozenset({"0", "false", "f", "no", "n", "off"})
+
+
+class Settings(msgspec.Struct, frozen=True, kw_only=True):
     """Centralised application settings.
 
     Phase 1 introduces placeholders for upcoming speech integrations while
     preserving backwards compatibility with the existing text endpoints.
-    """
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore",
-        populate_by_name=True,
-    )
+    Each field is read from the upper-cased environment variable of the same
+    name (``log_level`` from ``LOG_LEVEL``), falling back to ``.env``.
+    """
 
     # Core service metadata
-    api_title: str = Field(default="Gemma 3 API Service", description="Human readable API title")
-    api_version: str = Field(default="1.0.0", description="Semantic version exposed by FastAPI")
-    log_level: str = Field(
-        default="INFO",
-        alias="LOG_LEVEL",
-        description="Logging level used for application loggers.",
-    )
-    request_id_header: str = Field(
-        default="X-Request-ID",
-        alias="REQUEST_ID_HEADER",
-        description="HTTP header used to propagate the request identifier.",
-    )
+    api_title: Annotated[str, Meta(description="Human readable API title")] = "Gemma 3 API Service"
+    api_version: Annotated[str, Meta(description="Semantic version exposed by FastAPI")] = "1.0.0"
+    log_level: Annotated[
+        str, Meta(description="Logging level used for application loggers.")
+    ] = "INFO"
+    log_format: Annotated[
+        str, Meta(description="Log output format: 'text' for human readable lines or 'json'.")
+    ] = "text"
+    request_id_header: Annotated[
+        str, Meta(description="HTTP header used to propagate the request identifier.")
+    ] = "X-Request-ID"
+    observability_exclude_paths: Annotated[
+        frozenset[str],
+        Meta(description="Comma separated paths that skip request ids, request logs and metrics."),
+    ] = frozenset({"/metrics", "/health"})
+
+    metrics_cache_ttl_seconds: Annotated[
+        float,
+        Meta(ge=0, description="Seconds a rendered /metrics payload is reused across scrapes."),
+    ] = 1.0
 
     # API security configuration
-    api_key_enabled: bool = Field(
-        default=False,
-        alias="API_KEY_ENABLED",
-        description="Enable API key enforcement on incoming requests.",
-    )
-    api_key_header_name: str = Field(
-        default="X-API-Key",
-        alias="API_KEY_HEADER_NAME",
-        description="HTTP header name checked for API key authentication.",
-    )
-    api_keys: list[str] = Field(
-        default_factory=list,
-        alias="API_KEYS",
-        description="Comma separated list of valid API keys.",
-    )
-    rate_limit_enabled: bool = Field(
-        default=False,
-        alias="RATE_LIMIT_ENABLED",
-        description="Enable global rate limiting for REST and WebSocket clients.",
-    )
-    rate_limit_requests: PositiveInt = Field(
-        default=120,
-        alias="RATE_LIMIT_REQUESTS",
-        description="Number of allowed requests per sliding window before throttling.",
-    )
-    rate_limit_window_seconds: PositiveFloat = Field(
-        default=60.0,
-        alias="RATE_LIMIT_WINDOW_SECONDS",
-        description="Duration in seconds of the rolling window applied to rate limits.",
-    )
-    rate_limit_burst_multiplier: PositiveFloat = Field(
-        default=1.0,
-        alias="RATE_LIMIT_BURST_MULTIPLIER",
-        description="Multiplier applied to the base allowance to accommodate short bursts.",
-    )
+    api_key_enabled: Annotated[
+        bool, Meta(description="Enable API key enforcement on incoming requests.")
+    ] = False
+    api_key_header_name: Annotated[
+        str, Meta(description="HTTP header name checked for API key authentication.")
+    ] = "X-API-Key"
+    api_keys: Annotated[
+        frozenset[str], Meta(description="Comma separated list of valid API keys.")
+    ] = frozenset()
+    rate_limit_enabled: Annotated[
+        bool, Meta(description="Enable global rate limiting for REST and WebSocket clients.")
+    ] = False
+    rate_limit_requests: Annotated[
+        PositiveInt,
+        Meta(description="Number of allowed requests per sliding window before throttling."),
+    ] = 120
+    rate_limit_window_seconds: Annotated[
+        PositiveFloat,
+        Meta(description="Duration in seconds of the rolling window applied to rate limits."),
+    ] = 60.0
+    rate_limit_burst_multiplier: Annotated[
+        PositiveFloat,
+        Meta(description="Multiplier applied to the base allowance to accommodate short bursts."),
+    ] = 1.0
 
     # Hugging Face / LLM configuration
-    llm_repo_id: str = Field(
-        default="google/gemma-3-12b-it-qat-q4_0-gguf",
-        description="Repository identifier for the default Gemma GGUF checkpoint.",
-    )
-    llm_model_filename: str = Field(
-        default="gemma-3-12b-it-q4_0.gguf",
-        description="Filename of the quantised GGUF model to download from Hugging Face.",
-    )
-    hugging_face_hub_token: Optional[str] = Field(
-        default=None,
-        alias="HUGGING_FACE_HUB_TOKEN",
-        description="Optional access token for private Hugging Face repositories.",
-    )
-    llm_gpu_layers: int = Field(
-        default=-1,
-        description="Number of model layers to place on the GPU (-1 uses all available layers).",
-    )
-    llm_batch_size: PositiveInt = Field(
-        default=2048,
-        alias="LLM_BATCH_SIZE",
-        description="Batch size forwarded to llama.cpp during inference.",
-    )
-    llm_n_threads: PositiveInt = Field(
-        default=10,
-        alias="LLM_N_THREADS",
-        description="Number of CPU threads used by llama.cpp for residual work.",
-    )
-    llm_context_size: PositiveInt = Field(
-        default=32768,
-        alias="LLM_CONTEXT_SIZE",
-        description="Maximum context window forwarded to llama.cpp.",
-    )
+    llm_repo_id: Annotated[
+        str, Meta(description="Repository identifier for the default Gemma GGUF checkpoint.")
+    ] = "google/gemma-3-12b-it-qat-q4_0-gguf"
+    llm_model_filename: Annotated[
+        str, Meta(description="Filename of the quantised GGUF model to download from Hugging Face.")
+    ] = "gemma-3-12b-it-q4_0.gguf"
+    hugging_face_hub_token: Annotated[
+        Optional[str], Meta(description="Optional access token for private Hugging Face repositories.")
+    ] = None
+    llm_gpu_layers: Annotated[
+        int,
+        Meta(description="Number of model layers to place on the GPU (-1 uses all available layers)."),
+    ] = -1
+    llm_batch_size: Annotated[
+        PositiveInt, Meta(description="Batch size forwarded to llama.cpp during inference.")
+    ] = 2048
+    llm_n_threads: Annotated[
+        PositiveInt, Meta(description="Number of CPU threads used by llama.cpp for residual work.")
+    ] = 10
+    llm_context_size: Annotated[
+        PositiveInt, Meta(description="Maximum context window forwarded to llama.cpp.")
+    ] = 32768
+
+    stream_flush_tokens: Annotated[
+        PositiveInt, Meta(description="Tokens buffered before a streamed delta is flushed.")
+    ] = 8
+    stream_flush_interval_ms: Annotated[
+        float,
+        Meta(ge=0, description="Maximum time in milliseconds a streamed delta is held back."),
+    ] = 5.0
+    llm_prompt_cache_bytes: Annotated[
+        int,
+        Meta(
+            ge=0,
+            description="RAM budget for llama.cpp's prompt (KV state) cache; 0 disables it.",
+        ),
+    ] = 0
+
+    llm_use_mlock: Annotated[
+        bool,
+        Meta(description="Lock the memory-mapped model weights in RAM so they are never paged out."),
+    ] = False
+
+    llm_lora_path: Annotated[
+        Optional[str],
+        Meta(description="Optional path to a GGUF LoRA adapter applied by llama.cpp at load time."),
+    ] = None
+    llm_lora_scale: Annotated[
+        PositiveFloat, Meta(description="Scaling factor applied to the LoRA adapter deltas.")
+    ] = 1.0
 
     # Speech configuration (Phase 2 integrations)
-    openai_api_key: Optional[str] = Field(
-        default=None,
-        alias="OPENAI_API_KEY",
-        description="API key for upcoming OpenAI Whisper integrations.",
-    )
-    openai_api_base: Optional[str] = Field(
-        default=None,
-        alias="OPENAI_API_BASE",
-        description="Optional override for the OpenAI API base URL (useful for proxies).",
-    )
-    openai_timeout_seconds: PositiveFloat = Field(
-        default=60.0,
-        alias="OPENAI_TIMEOUT_SECONDS",
-        description="Network timeout applied to Whisper API requests.",
-    )
-    openai_whisper_model: str = Field(
-        default="gpt-4o-mini-transcribe",
-        alias="OPENAI_WHISPER_MODEL",
-        description="Default Whisper-compatible model deployed via the OpenAI API.",
-    )
-    openai_whisper_response_format: str = Field(
-        default="verbose_json",
-        alias="OPENAI_WHISPER_RESPONSE_FORMAT",
-        description="Preferred transcription response format returned by Whisper.",
-    )
-    openaudio_api_key: Optional[str] = Field(
-        default=None,
-        alias="OPENAUDIO_API_KEY",
-        description="Authentication token forwarded to the OpenAudio-S1-mini API.",
-    )
-    openaudio_api_base: str = Field(
-        default="http://localhost:8080",
-        alias="OPENAUDIO_API_BASE",
-        description="Base URL for the OpenAudio-S1-mini inference server.",
-    )
-    openaudio_tts_path: str = Field(
-        default="/v1/tts",
-        alias="OPENAUDIO_TTS_PATH",
-        description="Path component for the OpenAudio-S1-mini synthesis endpoint.",
-    )
-    openaudio_default_format: str = Field(
-        default="wav",
-        alias="OPENAUDIO_DEFAULT_FORMAT",
-        description="Audio container/codec requested from OpenAudio by default.",
-    )
-    openaudio_default_reference_id: Optional[str] = Field(
-        default=None,
-        alias="OPENAUDIO_DEFAULT_REFERENCE_ID",
-        description="Reference voice identifier forwarded to OpenAudio when supplied.",
-    )
-    openaudio_default_normalize: bool = Field(
-        default=True,
-        alias="OPENAUDIO_DEFAULT_NORMALIZE",
-        description="Whether to request loudness normalisation from OpenAudio by default.",
-    )
-    openaudio_timeout_seconds: PositiveFloat = Field(
-        default=120.0,
-        alias="OPENAUDIO_TIMEOUT_SECONDS",
-        description="Network timeout applied to OpenAudio synthesis requests.",
-    )
-    openaudio_max_retries: PositiveInt = Field(
-        default=3,
-        alias="OPENAUDIO_MAX_RETRIES",
-        description="Number of retry attempts for recoverable OpenAudio errors.",
-    )
-    default_audio_sample_rate: PositiveInt = Field(
-        default=16000,
-        alias="DEFAULT_AUDIO_SAMPLE_RATE",
-        description="Default PCM sample rate expected by the speech pipeline.",
-    )
-    enable_local_whisper: bool = Field(
-        default=False,
-        alias="ENABLE_LOCAL_WHISPER",
-        description="Feature flag toggling local Whisper inference vs hosted APIs.",
-    )
-    local_whisper_model: str = Field(
-        default="base",
-        alias="LOCAL_WHISPER_MODEL",
-        description="Model identifier used when running Whisper locally (e.g. tiny, base, large-v3).",
-    )
-
-    @field_validator("api_keys", mode="before")
+    openai_api_key: Annotated[
+        Optional[str], Meta(description="API key for upcoming OpenAI Whisper integrations.")
+    ] = None
+    openai_api_base: Annotated[
+        Optional[str],
+        Meta(description="Optional override for the OpenAI API base URL (useful for proxies)."),
+    ] = None
+    openai_timeout_seconds: Annotated[
+        PositiveFloat, Meta(description="Network timeout applied to Whisper API requests.")
+    ] = 60.0
+    openai_whisper_model: Annotated[
+        str, Meta(description="Default Whisper-compatible model deployed via the OpenAI API.")
+    ] = "gpt-4o-mini-transcribe"
+    openai_whisper_response_format: Annotated[
+        str, Meta(description="Preferred transcription response format returned by Whisper.")
+    ] = "verbose_json"
+    openaudio_api_key: Annotated[
+        Optional[str], Meta(description="Authentication token forwarded to the OpenAudio-S1-mini API.")
+    ] = None
+    openaudio_api_base: Annotated[
+        str, Meta(description="Base URL for the OpenAudio-S1-mini inference server.")
+    ] = "http://localhost:8080"
+    openaudio_tts_path: Annotated[
+        str, Meta(description="Path component for the OpenAudio-S1-mini synthesis endpoint.")
+    ] = "/v1/tts"
+    openaudio_default_format: Annotated[
+        str, Meta(description="Audio container/codec requested from OpenAudio by default.")
+    ] = "wav"
+    openaudio_default_reference_id: Annotated[
+        Optional[str],
+        Meta(description="Reference voice identifier forwarded to OpenAudio when supplied."),
+    ] = None
+    openaudio_default_normalize: Annotated[
+        bool,
+        Meta(description="Whether to request loudness normalisation from OpenAudio by default."),
+    ] = True
+    openaudio_timeout_seconds: Annotated[
+        PositiveFloat, Meta(description="Network timeout applied to OpenAudio synthesis requests.")
+    ] = 120.0
+    openaudio_max_retries: Annotated[
+        PositiveInt, Meta(description="Number of retry attempts for recoverable OpenAudio errors.")
+    ] = 3
+    openaudio_max_connections: Annotated[
+        PositiveInt, Meta(description="Maximum concurrent connections held open to OpenAudio.")
+    ] = 64
+    openaudio_max_keepalive_connections: Annotated[
+        int,
+        Meta(ge=0, description="Idle OpenAudio connections kept alive for reuse."),
+    ] = 32
+    openaudio_http2: Annotated[
+        bool,
+        Meta(description="Negotiate HTTP/2 with OpenAudio so concurrent requests share a connection."),
+    ] = False
+    openaudio_stream_chunk_bytes: Annotated[
+        int,
+        Meta(
+            ge=0,
+            description=(
+                "Re-chunk streamed OpenAudio audio into blocks of this many bytes; "
+                "0 forwards data as it arrives."
+            ),
+        ),
+    ] = 0
+    openaudio_result_cache_bytes: Annotated[
+        int,
+        Meta(
+            ge=0,
+            description=(
+                "Memory budget for reusing identical blocking OpenAudio syntheses; 0 disables it."
+            ),
+        ),
+    ] = 0
+    default_audio_sample_rate: Annotated[
+        PositiveInt, Meta(description="Default PCM sample rate expected by the speech pipeline.")
+    ] = 16000
+    enable_local_whisper: Annotated[
+        bool, Meta(description="Feature flag toggling local Whisper inference vs hosted APIs.")
+    ] = False
+    local_whisper_model: Annotated[
+        str,
+        Meta(
+            description="Model identifier used when running Whisper locally (e.g. tiny, base, large-v3)."
+        ),
+    ] = "base"
+
+    local_whisper_backend: Annotated[
+        Literal["openai-whisper", "faster-whisper"],
+        Meta(description="Local Whisper runtime: the reference PyTorch model or CTranslate2."),
+    ] = "openai-whisper"
+    local_whisper_workers: Annotated[
+        PositiveInt,
+        Meta(
+            description=(
+                "Concurrent transcriptions run on a local faster-whisper model; openai-whisper "
+                "always transcribes one clip at a time."
+            )
+        ),
+    ] = 1
+    local_whisper_compute_type: Annotated[
+        Optional[str],
+        Meta(
+            description=(
+                "CTranslate2 compute type for faster-whisper (e.g. int8, float16, int8_float16); "
+                "unset picks float16 on CUDA and int8 on CPU."
+            )
+        ),
+    ] = None
+    local_whisper_safetensors_dir: Annotated[
+        Optional[str],
+        Meta(
+            description=(
+                "Directory holding safetensors copies of openai-whisper checkpoints, written on "
+                "first load and memory-mapped afterwards; unset loads the original checkpoint."
+            )
+        ),
+    ] = None
+    whisper_cache_size: Annotated[
+        int,
+        Meta(
+            ge=0,
+            description=(
+                "Recent greedy transcriptions kept in process memory and replayed to any caller "
+                "uploading the same audio; 0 (the default) disables it."
+            ),
+        ),
+    ] = 0
+    whisper_cache_ttl_seconds: Annotated[
+        PositiveFloat, Meta(description="Seconds a cached transcription stays valid.")
+    ] = 3600.0
+    local_whisper_batch_size: Annotated[
+        PositiveInt,
+        Meta(
+            description=(
+                "Short openai-whisper clips decoded together in one batch; 1 disables batching. "
+                "Batches run on the same single model worker as unbatched clips."
+            )
+        ),
+    ] = 1
+    local_whisper_batch_wait_ms: Annotated[
+        float,
+        Meta(ge=0, description="Milliseconds the local Whisper batcher waits to fill a batch."),
+    ] = 50.0
+
     @classmethod
-    def _split_api_keys(cls, value: Optional[str | list[str]]) -> list[str]:
-        if value in (None, ""):
-            return []
-        if isinstance(value, str):
-            return [item.strip() for item in value.split(",") if item.strip()]
-        if isinstance(value, list):
-            return [item for item in value if item]
-        raise TypeError("Invalid value for API_KEYS")
+    def from_env(
+        cls,
+        environ: Optional[Mapping[str, str]] = None,
+        *,
+        env_file: str | Path | None = ".env",
+    ) -> "Settings":
+        """Build settings from environment variables, with ``env_file`` as a fallback."""
+
+        source: Dict[str, str] = {}
+        if env_file is not None:
+            source.update(_read_dotenv(Path(env_file)))
+        source.update(os.environ if environ is None else environ)
+        lookup = {key.upper(): value for key, value in source.items()}
+
+        values: Dict[str, Any] = {}
+        for name in cls.__struct_fields__:
+            raw = lookup.get(name.upper())
+            if raw is not None:
+                values[name] = raw
+        for name in _LIST_FIELDS:
+            if name in values:
+                values[name] = _split_list(values[name])
+        for name in _BOOL_FIELDS:
+            flag = values.get(name, "").strip().lower()
+            # Unknown spellings are left as strings for msgspec to reject.
+            if flag in _TRUE_STRINGS:
+                values[name] = True
+            elif flag in _FALSE_STRINGS:
+                values[name] = False
+        # Non-strict conversion coerces "8080"-style strings into the field types.
+        return cls.validate(values, strict=False)
+
+    @classmethod
+    def validate(cls, values: Mapping[str, Any], *, strict: bool = True) -> "Settings":
+        """Build settings from ``values``, checking every field's type and constraints.
+
+        Calling ``Settings(...)`` directly skips these checks, as msgspec only applies
+        them when converting; use this for settings assembled at runtime.
+        """
+
+        return msgspec.convert(dict(values), cls, strict=strict)
+
+
+# Boolean fields, read from the environment via _TRUE_STRINGS / _FALSE_STRINGS.
+_BOOL_FIELDS = tuple(name for name, hint in get_type_hints(Settings).items() if hint is bool)
+
+
+_settings: Optional[Settings] = None
 
 
-@lru_cache()
 def get_settings() -> Settings:
-    """Return a cached settings instance."""
+    """Return the process-wide settings, reading the environment on first use."""
 
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+
+def reset_for_tests() -> None:
+    """Forget the cached settings so the next :func:`get_settings` re-reads the environment.
+
+    This is the only supported way to invalidate the cache.
+    """
 
+    global _settings
+    _settings = None
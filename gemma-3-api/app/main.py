@@ -1,11 +1,17 @@
 """FastAPI application entrypoint."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Awaitable, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.api.router import api_router
+from app.api.dependencies import Services
+from app.api.router import build_api_router
 from app.config.settings import Settings, get_settings
 from app.observability import (
     RequestContextMiddleware,
@@ -16,7 +22,9 @@ from app.security import RateLimiter
 from app.services.conversation import ConversationService
 from app.services.openaudio import OpenAudioService
 from app.services.llm import LLMService
+from app.services.llm_scheduler import LLMScheduler
 from app.services.whisper import WhisperService
+from app.utils.json import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -26,44 +34,72 @@ async def lifespan(app: FastAPI):
     logger.info("Application startup...")
 
     settings = get_settings()
-    llm_service = LLMService(settings=settings)
-    llm_service.startup()
-    app.state.llm_service = llm_service
-
-    whisper_service = WhisperService(settings=settings)
-    await whisper_service.startup()
-    app.state.whisper_service = whisper_service
-
-    openaudio_service = OpenAudioService(settings=settings)
-    await openaudio_service.startup()
-    app.state.openaudio_service = openaudio_service
-
-    rate_limiter = RateLimiter(settings=settings)
-    app.state.rate_limiter = rate_limiter
-
-    conversation_service = ConversationService(
-        llm_service=llm_service,
-        whisper_service=whisper_service,
-        openaudio_service=openaudio_service,
+    # Teardown is registered as each service comes up, so shutdown runs in reverse
+    # order and a failure part-way through startup still releases what was started.
+    async with AsyncExitStack() as shutdown_stack:
+        llm_service = LLMService(settings=settings)
+        llm_service.startup()
+        shutdown_stack.callback(llm_service.shutdown)
+
+        llm_scheduler = LLMScheduler(
+            llm_service,
+            batch_size=settings.stream_flush_tokens,
+            batch_interval=settings.stream_flush_interval_ms / 1000,
+        )
+        await llm_scheduler.startup()
+        shutdown_stack.push_async_callback(llm_scheduler.shutdown)
+
+        # The speech clients are independent I/O set-up, so they start (and stop)
+        # concurrently. Both shutdowns tolerate a service that never started, which
+        # lets the teardown be registered before either startup can fail.
+        whisper_service = WhisperService(settings=settings)
+        openaudio_service = OpenAudioService(settings=settings)
+        shutdown_stack.push_async_callback(
+            _gather_shutdown, whisper_service.shutdown, openaudio_service.shutdown
+        )
+        await asyncio.gather(whisper_service.startup(), openaudio_service.startup())
+
+        app.state.rate_limiter = RateLimiter(settings=settings)
+        shutdown_stack.callback(setattr, app.state, "rate_limiter", None)
+
+        conversation_service = ConversationService(
+            llm_scheduler=llm_scheduler,
+            whisper_service=whisper_service,
+            openaudio_service=openaudio_service,
+        )
+        app.state.services = Services(
+            llm=llm_service,
+            llm_scheduler=llm_scheduler,
+            whisper=whisper_service,
+            openaudio=openaudio_service,
+            conversation=conversation_service,
+        )
+        shutdown_stack.callback(setattr, app.state, "services", None)
+
+        try:
+            yield
+        finally:
+            logger.info("Application shutdown...")
+
+
+async def _gather_shutdown(*shutdowns: Callable[[], Awaitable[None]]) -> None:
+    """Run independent shutdown coroutines concurrently."""
+
+    await asyncio.gather(*(shutdown() for shutdown in shutdowns))
+
+
+async def _http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """FastAPI's default HTTPException handler, rendering the body with orjson."""
+
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return Response(
+        dumps({"detail": exc.detail}),
+        status_code=exc.status_code,
+        headers=headers,
+        media_type="application/json",
     )
-    app.state.conversation_service = conversation_service
-
-    try:
-        yield
-    finally:
-        logger.info("Application shutdown...")
-        if hasattr(app.state, "conversation_service") and app.state.conversation_service is not None:
-            app.state.conversation_service = None
-        if hasattr(app.state, "openaudio_service") and app.state.openaudio_service is not None:
-            await app.state.openaudio_service.shutdown()
-            app.state.openaudio_service = None
-        if hasattr(app.state, "whisper_service") and app.state.whisper_service is not None:
-            await app.state.whisper_service.shutdown()
-            app.state.whisper_service = None
-        if hasattr(app.state, "rate_limiter") and app.state.rate_limiter is not None:
-            app.state.rate_limiter = None
-        llm_service.shutdown()
-        app.state.llm_service = None
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
@@ -71,14 +107,17 @@ def create_app(settings: Settings | None = None) -> FastAPI:
 
     configure_logging(settings)
 
+    # The default response class is kept on purpose: with a response model FastAPI
+    # serialises straight to JSON bytes via Pydantic, which a custom class disables.
     application = FastAPI(
         title=settings.api_title,
         version=settings.api_version,
         lifespan=lifespan,
     )
+    application.add_exception_handler(StarletteHTTPException, _http_exception_handler)
     application.add_middleware(RequestContextMiddleware, settings=settings)
-    application.include_router(api_router)
-    register_metrics_endpoint(application)
+    application.include_router(build_api_router(settings))
+    register_metrics_endpoint(application, ttl_seconds=settings.metrics_cache_ttl_seconds)
 
     @application.get("/health")
     async def health_check() -> dict[str, str]:
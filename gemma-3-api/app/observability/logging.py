@@ -3,16 +3,24 @@
 from __future__ import annotations
 
 import logging
+import time
 from logging.config import dictConfig
 from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Any
 
 from app.config.settings import Settings
+from app.utils.json import dumps
 
 _REQUEST_ID: ContextVar[str] = ContextVar("request_id", default="-")
 
 
 class RequestIdFilter(logging.Filter):
-    """Inject the current request id into log records."""
+    """Inject the current request id into log records.
+
+    ``configure_logging`` installs a record factory instead; this filter remains for
+    handlers configured outside of it.
+    """
 
     def filter(self, record: logging.LogRecord) -> bool:  # pragma: no cover - exercised indirectly
         record.request_id = _REQUEST_ID.get()
@@ -31,27 +39,76 @@ def reset_request_id(token: Token[str]) -> None:
     _REQUEST_ID.reset(token)
 
 
+def _install_record_factory() -> None:
+    """Stamp the request id on every record as it is created, once per record."""
+
+    base_factory = logging.getLogRecordFactory()
+    if getattr(base_factory, "_injects_request_id", False):
+        return
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = base_factory(*args, **kwargs)
+        record.request_id = _REQUEST_ID.get()
+        return record
+
+    factory._injects_request_id = True  # type: ignore[attr-defined]
+    logging.setLogRecordFactory(factory)
+
+
+class TextFormatter(logging.Formatter):
+    """``%``-style formatter that renders the date part of ``asctime`` once per second."""
+
+    _cached_second: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, prefix = self._cached_second
+        if second != cached_second:
+            prefix = time.strftime(self.default_time_format, self.converter(second))
+            # A single tuple assignment keeps the cache consistent across threads.
+            self._cached_second = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+
+
+class JsonFormatter(logging.Formatter):
+    """Render records as single-line JSON objects using orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return dumps(payload).decode()
+
+
 def configure_logging(settings: Settings) -> None:
     """Configure application logging using the provided settings."""
 
     log_level = settings.log_level.upper()
-    request_filter = RequestIdFilter()
+    _install_record_factory()
 
     dictConfig(
         {
             "version": 1,
             "disable_existing_loggers": False,
-            "filters": {"request_id": {"()": RequestIdFilter}},
             "formatters": {
                 "standard": {
+                    "()": TextFormatter,
                     "format": "%(asctime)s | %(levelname)s | %(name)s | request_id=%(request_id)s | %(message)s",
-                }
+                },
+                "json": {"()": JsonFormatter},
             },
             "handlers": {
                 "default": {
                     "class": "logging.StreamHandler",
-                    "formatter": "standard",
-                    "filters": ["request_id"],
+                    "formatter": "json" if settings.log_format.lower() == "json" else "standard",
                 }
             },
             "loggers": {
@@ -79,6 +136,3 @@ def configure_logging(settings: Settings) -> None:
     )
 
     logging.getLogger(__name__).debug("Logging configured at level %s", log_level)
-
-    # Ensure the filter is registered on the root logger so custom handlers inherit it.
-    logging.getLogger().addFilter(request_filter)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.responses import Response
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
 
@@ -19,12 +22,12 @@ _http_request_latency = Histogram(
 _http_request_total = Counter(
     "app_http_requests_total",
     "Total number of processed HTTP requests",
-    labelnames=("method", "route", "status"),
+    labelnames=("method", "route", "status_class"),
 )
 _http_request_errors = Counter(
     "app_http_request_errors_total",
     "Total number of HTTP requests that raised server errors",
-    labelnames=("method", "route", "status"),
+    labelnames=("method", "route", "status_class"),
 )
 _external_call_latency = Histogram(
     "app_external_call_duration_seconds",
@@ -51,6 +54,14 @@ _rate_limit_rejections = Counter(
     "Number of requests rejected by rate limiting",
     labelnames=("scope",),
 )
+# The rate limiter only ever uses these scopes, so their children are bound up front.
+_rate_limit_rejection_children: Dict[str, Counter] = {
+    scope: _rate_limit_rejections.labels(scope=scope) for scope in ("api_key", "ip")
+}
+
+
+# Status codes are bucketed by class so each route/method pair yields at most five series.
+_STATUS_CLASSES = ("1xx", "1xx", "2xx", "3xx", "4xx", "5xx")
 
 
 def _normalise_route(route: Optional[str]) -> str:
@@ -59,45 +70,168 @@ def _normalise_route(route: Optional[str]) -> str:
     return route
 
 
+def _status_class(status_code: int) -> str:
+    return _STATUS_CLASSES[min(max(status_code // 100, 1), 5)]
+
+
+class _RouteSeries:
+    """Label children for one (method, route) pair, bound on first use.
+
+    ``labels()`` hashes and validates its arguments on every call; keeping the
+    bound children means steady-state requests only pay a dict lookup.
+    """
+
+    __slots__ = ("latency", "_method", "_route", "_totals", "_errors")
+
+    def __init__(self, method: str, route: str) -> None:
+        self._method = method
+        self._route = route
+        self.latency = _http_request_latency.labels(method=method, route=route)
+        self._totals: Dict[str, Counter] = {}
+        self._errors: Dict[str, Counter] = {}
+
+    def total(self, status_class: str) -> Counter:
+        child = self._totals.get(status_class)
+        if child is None:
+            child = _http_request_total.labels(
+                method=self._method, route=self._route, status_class=status_class
+            )
+            self._totals[status_class] = child
+        return child
+
+    def errors(self, status_class: str) -> Counter:
+        child = self._errors.get(status_class)
+        if child is None:
+            child = _http_request_errors.labels(
+                method=self._method, route=self._route, status_class=status_class
+            )
+            self._errors[status_class] = child
+        return child
+
+
+# Bounded as a safeguard against callers passing unnormalised routes; pairs beyond
+# the cap are still recorded, just without memoisation.
+_MAX_ROUTE_SERIES = 1024
+_route_series: Dict[Tuple[str, str], _RouteSeries] = {}
+
+
+def _series_for(method: str, route: str) -> _RouteSeries:
+    key = (method, route)
+    series = _route_series.get(key)
+    if series is None:
+        series = _RouteSeries(method, route)
+        if len(_route_series) < _MAX_ROUTE_SERIES:
+            _route_series[key] = series
+    return series
+
+
 def record_http_request(method: str, route: Optional[str], status_code: int, duration_seconds: float) -> None:
     """Record metrics for a handled HTTP request."""
 
-    normalized_route = _normalise_route(route)
-    _http_request_latency.labels(method=method, route=normalized_route).observe(duration_seconds)
-    status_str = str(status_code)
-    _http_request_total.labels(method=method, route=normalized_route, status=status_str).inc()
+    series = _series_for(method, _normalise_route(route))
+    series.latency.observe(duration_seconds)
+    status_class = _status_class(status_code)
+    series.total(status_class).inc()
     if status_code >= 500:
-        _http_request_errors.labels(method=method, route=normalized_route, status=status_str).inc()
+        series.errors(status_class).inc()
+
+
+# (latency, errors) children per service / pipeline name; both sets of names are
+# fixed string literals in the services, so these caches stay small.
+_external_call_children: Dict[str, Tuple[Histogram, Counter]] = {}
+_pipeline_children: Dict[str, Tuple[Histogram, Counter]] = {}
+
+
+def _bound_pair(
+    cache: Dict[str, Tuple[Histogram, Counter]],
+    latency: Histogram,
+    errors: Counter,
+    label_value: str,
+) -> Tuple[Histogram, Counter]:
+    pair = cache.get(label_value)
+    if pair is None:
+        pair = (latency.labels(label_value), errors.labels(label_value))
+        cache[label_value] = pair
+    return pair
 
 
 def record_external_call(service: str, duration_seconds: float, *, success: bool) -> None:
     """Record metrics for a call to an external dependency."""
 
-    _external_call_latency.labels(service=service).observe(duration_seconds)
+    latency, errors = _bound_pair(
+        _external_call_children, _external_call_latency, _external_call_errors, service
+    )
+    latency.observe(duration_seconds)
     if not success:
-        _external_call_errors.labels(service=service).inc()
+        errors.inc()
 
 
 def record_pipeline(pipeline: str, duration_seconds: float, *, success: bool) -> None:
     """Record metrics for a full orchestration pipeline."""
 
-    _pipeline_latency.labels(pipeline=pipeline).observe(duration_seconds)
+    latency, errors = _bound_pair(_pipeline_children, _pipeline_latency, _pipeline_errors, pipeline)
+    latency.observe(duration_seconds)
     if not success:
-        _pipeline_errors.labels(pipeline=pipeline).inc()
+        errors.inc()
 
 
 def record_rate_limit_rejection(scope: str) -> None:
     """Increment the counter for throttled requests."""
 
-    _rate_limit_rejections.labels(scope=scope).inc()
+    child = _rate_limit_rejection_children.get(scope)
+    if child is None:
+        child = _rate_limit_rejections.labels(scope=scope)
+    child.inc()
+
+
+class MetricsSnapshot:
+    """Exposition text rendered off the event loop and reused for ``ttl_seconds``.
+
+    Scrapes within the window are served from memory. The gzip variant is only
+    compressed the first time a client asks for it in each window, so a scraper
+    that always sends ``Accept-Encoding: gzip`` never pays for both encodings.
+    """
+
+    def __init__(self, ttl_seconds: float = 1.0) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = asyncio.Lock()
+        self._expires_at = 0.0
+        self._plain = b""
+        self._gzipped: Optional[bytes] = None
+
+    async def get(self, *, gzipped: bool) -> bytes:
+        if time.monotonic() >= self._expires_at or (gzipped and self._gzipped is None):
+            async with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    self._plain = await asyncio.to_thread(generate_latest)
+                    self._gzipped = None
+                    self._expires_at = time.monotonic() + self._ttl_seconds
+                if gzipped and self._gzipped is None:
+                    self._gzipped = await asyncio.to_thread(gzip.compress, self._plain, 6)
+        if gzipped:
+            assert self._gzipped is not None
+            return self._gzipped
+        return self._plain
+
+
+def register_metrics_endpoint(app: FastAPI, *, ttl_seconds: float = 1.0) -> None:
+    """Expose a Prometheus scrape endpoint on ``/metrics``.
 
+    Scrapes within ``ttl_seconds`` of each other share one rendered payload.
+    """
 
-def register_metrics_endpoint(app: FastAPI) -> None:
-    """Expose a Prometheus scrape endpoint on ``/metrics``."""
+    snapshot = MetricsSnapshot(ttl_seconds=ttl_seconds)
 
     @app.get("/metrics")
-    async def metrics_endpoint() -> Response:  # pragma: no cover - exercised in integration tests
-        payload = generate_latest()
-        return Response(payload, media_type=CONTENT_TYPE_LATEST)
+    async def metrics_endpoint(request: Request) -> Response:  # pragma: no cover - exercised in integration tests
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            payload = await snapshot.get(gzipped=True)
+            return Response(
+                payload,
+                media_type=CONTENT_TYPE_LATEST,
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+        payload = await snapshot.get(gzipped=False)
+        return Response(payload, media_type=CONTENT_TYPE_LATEST, headers={"Vary": "Accept-Encoding"})
 
     logger.info("Registered /metrics endpoint for Prometheus scraping")
@@ -2,47 +2,99 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
+import os
+import secrets
 import time
-import uuid
-from typing import Awaitable, Callable
 
-from fastapi import Request
-from starlette.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config.settings import Settings
 from app.observability.logging import bind_request_id, reset_request_id
 from app.observability.metrics import record_http_request
+from app.utils.headers import header_key
 
 logger = logging.getLogger(__name__)
 
+# Methods are arbitrary tokens on the wire; anything else is labelled "OTHER".
+_METRIC_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Attach request identifiers, emit structured logs and record metrics."""
+# Generated ids are a random per-process prefix plus a counter, avoiding a urandom read
+# per request. Forked workers draw a fresh prefix so their ids cannot collide.
+_request_id_prefix = secrets.token_hex(8)
+_request_id_counter = itertools.count()
+
+
+def _reseed_request_ids() -> None:
+    global _request_id_prefix, _request_id_counter
+    _request_id_prefix = secrets.token_hex(8)
+    _request_id_counter = itertools.count()
+
+
+os.register_at_fork(after_in_child=_reseed_request_ids)
+
+
+def new_request_id() -> str:
+    """Return a process-unique 32 character hexadecimal request identifier."""
+
+    return f"{_request_id_prefix}{next(_request_id_counter):016x}"
+
+
+class RequestContextMiddleware:
+    """Attach request identifiers, emit structured logs and record metrics.
+
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware`` so requests are
+    not wrapped in an extra task and memory stream; the status code is read from
+    the ``http.response.start`` message and the request id header injected there.
+    """
 
     def __init__(self, app: ASGIApp, *, settings: Settings) -> None:
-        super().__init__(app)
-        self._settings = settings
-
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        request_id = request.headers.get(self._settings.request_id_header) or str(uuid.uuid4())
+        self.app = app
+        self._request_id_header = header_key(settings.request_id_header)
+        # Scrapes and health probes are polled constantly and are not worth instrumenting.
+        self._exclude_paths = settings.observability_exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self._exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        header_name = self._request_id_header
+        # The raw header bytes are kept so an incoming id is echoed back without re-encoding.
+        raw_request_id = b""
+        for name, value in scope["headers"]:
+            if name == header_name:
+                raw_request_id = value
+                break
+        if raw_request_id:
+            request_id = raw_request_id.decode("latin-1")
+        else:
+            request_id = new_request_id()
+            raw_request_id = request_id.encode("ascii")
         token = bind_request_id(request_id)
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        start = time.perf_counter()
-        route = getattr(request.scope.get("route"), "path", request.url.path)
-        method = request.method
+        status_code = 500
 
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = message.get("headers", [])
+                if not any(name.lower() == header_name for name, _ in headers):
+                    message["headers"] = [*headers, (header_name, raw_request_id)]
+            await send(message)
+
+        method = scope["method"]
+        if method not in _METRIC_METHODS:
+            method = "OTHER"
+        start = time.perf_counter()
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception:
             duration = time.perf_counter() - start
+            route = _route_for(scope)
             record_http_request(method, route, 500, duration)
             logger.exception(
                 "Unhandled exception during request",
@@ -51,18 +103,27 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raise
         else:
             duration = time.perf_counter() - start
-            status_code = getattr(response, "status_code", 500)
+            route = _route_for(scope)
             record_http_request(method, route, status_code, duration)
-            response.headers.setdefault(self._settings.request_id_header, request_id)
-            logger.info(
-                "Request processed",
-                extra={
-                    "method": method,
-                    "route": route,
-                    "status_code": status_code,
-                    "duration_ms": round(duration * 1000, 2),
-                },
-            )
-            return response
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Request processed",
+                    extra={
+                        "method": method,
+                        "route": route,
+                        "status_code": status_code,
+                        "duration_ms": round(duration * 1000, 2),
+                    },
+                )
         finally:
             reset_request_id(token)
+
+
+def _route_for(scope: Scope) -> str:
+    """Return the matched route template set on the scope by the router.
+
+    Unmatched requests share one ``"unmatched"`` label; raw paths are never used
+    as label values since every distinct URL would become a new series.
+    """
+
+    return getattr(scope.get("route"), "path", None) or "unmatched"
@@ -1,6 +1,14 @@
 """Schema exports."""
 
-from .generation import GenerationRequest, GenerationResponse, ModelInfo, ModelListResponse
+from .generation import (
+    BatchTokenizeRequest,
+    BatchTokenizeResponse,
+    GenerationRequest,
+    GenerationRequestMsg,
+    GenerationResponse,
+    ModelInfo,
+    ModelListResponse,
+)
 from .speech import (
     SpeechDialogueResponse,
     SpeechSynthesisRequest,
@@ -11,7 +19,10 @@ from .speech import (
 )
 
 __all__ = [
+    "BatchTokenizeRequest",
+    "BatchTokenizeResponse",
     "GenerationRequest",
+    "GenerationRequestMsg",
     "GenerationResponse",
     "ModelInfo",
     "ModelListResponse",
@@ -1,9 +1,18 @@
 """Pydantic models for text generation endpoints."""
 
-from typing import List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Union
 
+import msgspec
+from msgspec import UNSET, Meta, UnsetType
 from pydantic import BaseModel, Field
 
+# llama.cpp only honours ``stop`` when it is a list, so requests receive a list copy.
+DEFAULT_STOP_SEQUENCES: tuple[str, ...] = ("<|endoftext|>", "<|im_end|>")
+
+
+def _default_stop_sequences() -> List[str]:
+    return list(DEFAULT_STOP_SEQUENCES)
+
 
 class GenerationRequest(BaseModel):
     prompt: str
@@ -13,7 +22,7 @@ class GenerationRequest(BaseModel):
     top_k: int = Field(default=40, ge=0)
     repeat_penalty: float = Field(default=1.1, ge=0.0)
     stop: Optional[List[str]] = Field(
-        default_factory=lambda: ["<|endoftext|>", "<|im_end|>"],
+        default_factory=_default_stop_sequences,
         description="Stop sequences forwarded to llama.cpp",
     )
     seed: Optional[int] = Field(default=None, ge=0)
@@ -21,6 +30,47 @@ class GenerationRequest(BaseModel):
     tfs_z: float = Field(default=1.0, ge=0.0)
     typical_p: float = Field(default=1.0, ge=0.0)
 
+    def to_llama_kwargs(self) -> Dict[str, Any]:
+        """Return explicitly set fields as llama.cpp keyword arguments.
+
+        Equivalent to ``model_dump(exclude_unset=True)`` for this flat schema, without
+        going through Pydantic's generic serializer.
+        """
+
+        return {name: getattr(self, name) for name in self.__pydantic_fields_set__}
+
+
+class GenerationRequestMsg(msgspec.Struct):
+    """Compiled decoder mirroring :class:`GenerationRequest` for WebSocket messages.
+
+    Optional fields default to ``UNSET`` so that, like ``exclude_unset``, only values
+    supplied by the client are forwarded to llama.cpp.
+    """
+
+    prompt: str
+    max_tokens: Union[Annotated[int, Meta(ge=1, le=4096)], UnsetType] = UNSET
+    temperature: Union[Annotated[float, Meta(ge=0.0)], UnsetType] = UNSET
+    top_p: Union[Annotated[float, Meta(ge=0.0, le=1.0)], UnsetType] = UNSET
+    top_k: Union[Annotated[int, Meta(ge=0)], UnsetType] = UNSET
+    repeat_penalty: Union[Annotated[float, Meta(ge=0.0)], UnsetType] = UNSET
+    stop: Union[Optional[List[str]], UnsetType] = UNSET
+    seed: Union[Optional[Annotated[int, Meta(ge=0)]], UnsetType] = UNSET
+    min_p: Union[Annotated[float, Meta(ge=0.0)], UnsetType] = UNSET
+    tfs_z: Union[Annotated[float, Meta(ge=0.0)], UnsetType] = UNSET
+    typical_p: Union[Annotated[float, Meta(ge=0.0)], UnsetType] = UNSET
+
+    def to_llama_kwargs(self) -> Dict[str, Any]:
+        """Return the supplied fields as llama.cpp keyword arguments."""
+
+        return {
+            name: value
+            for name in self.__struct_fields__
+            if (value := getattr(self, name)) is not UNSET
+        }
+
+
+generation_request_decoder = msgspec.json.Decoder(GenerationRequestMsg)
+
 
 class GenerationResponse(BaseModel):
     generated_text: str
@@ -35,3 +85,11 @@ class ModelInfo(BaseModel):
 class ModelListResponse(BaseModel):
     models: List[ModelInfo]
 
+
+class BatchTokenizeRequest(BaseModel):
+    inputs: List[str] = Field(..., min_length=1, max_length=256)
+    add_bos: bool = Field(default=True, description="Prepend the model's BOS token to each input.")
+
+
+class BatchTokenizeResponse(BaseModel):
+    tokens: List[List[int]]
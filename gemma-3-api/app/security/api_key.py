@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, Request, WebSocket
 
 from app.config.settings import Settings, get_settings
+from app.utils.headers import find_header, header_key
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +23,34 @@ def require_api_key(
     if not settings.api_key_enabled:
         return
 
-    provided_key = _extract_header(request.headers.get, settings.api_key_header_name)
+    header_name = settings.api_key_header_name
+    provided_key = find_header(request.scope, header_key(header_name)) if header_name else None
     if provided_key is None:
         raise HTTPException(status_code=401, detail="Missing API key")
 
-    if provided_key not in settings.api_keys:
+    if not _is_valid_key(provided_key, settings.api_keys):
         logger.warning("Rejected request with invalid API key")
         raise HTTPException(status_code=403, detail="Invalid API key")
 
 
-def _extract_header(getter, header_name: str) -> str | None:
-    if not header_name:
-        return None
-    return getter(header_name)
+def _key_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=4)
+def _api_key_digests(api_keys: frozenset[str]) -> frozenset[bytes]:
+    return frozenset(_key_digest(key) for key in api_keys)
+
+
+def _is_valid_key(provided_key: str, api_keys: frozenset[str]) -> bool:
+    """Check ``provided_key`` by digest, so no plaintext comparison can short-circuit.
+
+    Looking up the digest of the provided key reveals nothing about how many leading
+    characters it shares with a configured key.
+    """
+
+    # ``Settings(...)`` built directly is not converted, so keys may still be a list.
+    return _key_digest(provided_key) in _api_key_digests(frozenset(api_keys))
 
 
 async def enforce_websocket_api_key(
@@ -46,12 +64,13 @@ async def enforce_websocket_api_key(
     if not settings.api_key_enabled:
         return True
 
-    provided_key = _extract_header(websocket.headers.get, settings.api_key_header_name)
+    header_name = settings.api_key_header_name
+    provided_key = find_header(websocket.scope, header_key(header_name)) if header_name else None
     if provided_key is None:
         await websocket.close(code=4401, reason="Missing API key")
         return False
 
-    if provided_key not in settings.api_keys:
+    if not _is_valid_key(provided_key, settings.api_keys):
         logger.warning("Rejected WebSocket connection with invalid API key")
         await websocket.close(code=4403, reason="Invalid API key")
         return False
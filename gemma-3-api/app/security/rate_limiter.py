@@ -2,32 +2,42 @@
 
 from __future__ import annotations
 
-import asyncio
+import heapq
 import math
 import time
 from dataclasses import dataclass
 from types import SimpleNamespace
-from typing import Callable, Tuple
+from typing import Tuple
 
 from fastapi import Depends, HTTPException, Request, status
 from starlette.websockets import WebSocket
 
 from app.config.settings import Settings
 from app.observability import record_rate_limit_rejection
+from app.utils.headers import find_header, header_key
 
 
-@dataclass
+# Upper bound on expiry-heap entries examined per ``acquire`` call.
+_CLEANUP_BATCH = 8
+
+
+@dataclass(slots=True)
 class _TokenBucket:
     tokens: float
     last_refill: float
 
 
 class RateLimiter:
-    """A simple token-bucket rate limiter with async safety."""
+    """A simple token-bucket rate limiter for a single event loop.
+
+    Bucket updates never await, so each one runs to completion on the loop without
+    a lock; concurrent clients therefore never queue behind one another.
+    """
 
     def __init__(self, *, settings: Settings) -> None:
         self.enabled = settings.rate_limit_enabled
         self._api_key_header = settings.api_key_header_name
+        self._api_key_header_key = header_key(settings.api_key_header_name)
         raw_capacity = float(settings.rate_limit_requests) * float(
             settings.rate_limit_burst_multiplier
         )
@@ -35,42 +45,51 @@ class RateLimiter:
         window = float(settings.rate_limit_window_seconds)
         self._refill_rate = self._capacity / window if window > 0 else float("inf")
         self._bucket_ttl = window * 5
-        self._lock = asyncio.Lock()
         self._buckets: dict[str, _TokenBucket] = {}
+        # Each bucket has exactly one ``(expires_at, key)`` entry; live buckets found at
+        # the head are pushed back with their renewed deadline instead of being dropped.
+        self._expiry: list[tuple[float, str]] = []
 
     async def acquire(self, identifier: str, scope: str) -> Tuple[bool, float]:
         """Attempt to consume a single token for ``identifier``."""
 
+        return self.try_acquire(identifier, scope)
+
+    def try_acquire(self, identifier: str, scope: str) -> Tuple[bool, float]:
+        """Synchronous form of :meth:`acquire` for callers already on the event loop.
+
+        The check never waits, so the request dependencies call this directly and
+        skip creating and awaiting a coroutine per request.
+        """
+
         if not self.enabled or self._capacity <= 0:
             return True, 0.0
 
         now = time.monotonic()
         bucket_key = f"{scope}:{identifier}"
 
-        async with self._lock:
-            bucket = self._buckets.get(bucket_key)
-            if bucket is None:
-                bucket = _TokenBucket(tokens=self._capacity, last_refill=now)
-            else:
-                elapsed = max(0.0, now - bucket.last_refill)
-                bucket.tokens = min(
-                    self._capacity, bucket.tokens + (elapsed * self._refill_rate)
-                )
-                bucket.last_refill = now
-
-            allowed = bucket.tokens >= 1.0
-            if allowed:
-                bucket.tokens -= 1.0
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = _TokenBucket(tokens=self._capacity, last_refill=now)
             self._buckets[bucket_key] = bucket
+            heapq.heappush(self._expiry, (now + self._bucket_ttl, bucket_key))
+        else:
+            elapsed = max(0.0, now - bucket.last_refill)
+            bucket.tokens = min(self._capacity, bucket.tokens + (elapsed * self._refill_rate))
+            bucket.last_refill = now
+
+        allowed = bucket.tokens >= 1.0
+        if allowed:
+            bucket.tokens -= 1.0
 
-            self._cleanup_locked(now)
+        self._cleanup_expired(now)
 
-            if allowed:
-                return True, 0.0
+        if allowed:
+            return True, 0.0
 
-            retry_after = 0.0
-            if self._refill_rate > 0:
-                retry_after = max(0.0, (1.0 - bucket.tokens) / self._refill_rate)
+        retry_after = 0.0
+        if self._refill_rate > 0:
+            retry_after = max(0.0, (1.0 - bucket.tokens) / self._refill_rate)
 
         record_rate_limit_rejection(scope)
         return False, retry_after
@@ -78,7 +97,9 @@ class RateLimiter:
     def identifier_from_request(self, request: Request) -> Tuple[str, str]:
         """Derive the rate limit bucket identifier for an HTTP request."""
 
-        header_value = self._extract_header(request.headers.get)
+        header_value = (
+            find_header(request.scope, self._api_key_header_key) if self._api_key_header else None
+        )
         if header_value:
             return header_value, "api_key"
 
@@ -88,7 +109,9 @@ class RateLimiter:
     def identifier_from_websocket(self, websocket: WebSocket) -> Tuple[str, str]:
         """Derive the identifier for WebSocket clients."""
 
-        header_value = self._extract_header(websocket.headers.get)
+        header_value = (
+            find_header(websocket.scope, self._api_key_header_key) if self._api_key_header else None
+        )
         if header_value:
             return header_value, "api_key"
 
@@ -96,21 +119,22 @@ class RateLimiter:
         client_host = getattr(client, "host", "anonymous") if client else "anonymous"
         return client_host or "anonymous", "ip"
 
-    def _extract_header(self, getter: Callable[[str], str | None]) -> str | None:
-        if not self._api_key_header:
-            return None
-        return getter(self._api_key_header)
+    def _cleanup_expired(self, now: float) -> None:
+        """Evict idle buckets, examining at most ``_CLEANUP_BATCH`` heap entries."""
 
-    def _cleanup_locked(self, now: float) -> None:
-        if self._bucket_ttl <= 0:
-            return
-        expired_keys = [
-            key
-            for key, bucket in self._buckets.items()
-            if (now - bucket.last_refill) > self._bucket_ttl
-        ]
-        for key in expired_keys:
-            self._buckets.pop(key, None)
+        expiry = self._expiry
+        for _ in range(_CLEANUP_BATCH):
+            if not expiry or expiry[0][0] > now:
+                return
+            _, key = heapq.heappop(expiry)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            expires_at = bucket.last_refill + self._bucket_ttl
+            if expires_at < now:
+                del self._buckets[key]
+            else:
+                heapq.heappush(expiry, (expires_at, key))
 
 
 def get_rate_limiter_from_request(request: Request) -> RateLimiter | None:
@@ -130,7 +154,7 @@ async def enforce_rate_limit(
         return
 
     identifier, scope = limiter.identifier_from_request(request)
-    allowed, retry_after = await limiter.acquire(identifier, scope)
+    allowed, retry_after = limiter.try_acquire(identifier, scope)
     if allowed:
         return
 
@@ -157,7 +181,7 @@ async def enforce_websocket_rate_limit(
         return True
 
     identifier, scope = limiter.identifier_from_websocket(websocket)
-    allowed, _ = await limiter.acquire(identifier, scope)
+    allowed, _ = limiter.try_acquire(identifier, scope)
     if allowed:
         return True
 
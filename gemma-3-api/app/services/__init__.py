@@ -2,17 +2,24 @@
 
 from .conversation import ConversationService, DialogueResult, DialogueStreamResult
 from .openaudio import OpenAudioService, OpenAudioSynthesisResult, OpenAudioSynthesisStream
-from .llm import LLMService
-from .whisper import WhisperService, WhisperTranscription, WhisperTranscriptionSegment
+from .llm import LlamaLoadConfig, LLMService
+from .llm_scheduler import LLMScheduler, SequenceHandle
+from .whisper import AudioInput, WhisperService, WhisperTranscription, WhisperTranscriptionSegment
+from .whisper_batcher import WhisperBatcher
 
 __all__ = [
+    "AudioInput",
     "ConversationService",
     "DialogueResult",
     "DialogueStreamResult",
     "OpenAudioService",
     "OpenAudioSynthesisResult",
     "OpenAudioSynthesisStream",
+    "LlamaLoadConfig",
     "LLMService",
+    "LLMScheduler",
+    "SequenceHandle",
+    "WhisperBatcher",
     "WhisperService",
     "WhisperTranscription",
     "WhisperTranscriptionSegment",
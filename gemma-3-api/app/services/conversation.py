@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
@@ -13,10 +12,13 @@ from app.services.openaudio import (
     OpenAudioSynthesisResult,
     OpenAudioSynthesisStream,
 )
-from app.services.llm import LLMService
-from app.services.whisper import WhisperService, WhisperTranscription
+from app.services.llm_scheduler import LLMScheduler
+from app.services.whisper import AudioInput, WhisperService, WhisperTranscription
 from app.observability.metrics import record_external_call, record_pipeline
 
+# Set by the pipeline itself, never by client-supplied synthesis overrides.
+_SYNTHESIS_RESERVED_KEYS = frozenset({"text", "stream"})
+
 
 @dataclass(slots=True)
 class DialogueResult:
@@ -42,18 +44,18 @@ class ConversationService:
     def __init__(
         self,
         *,
-        llm_service: LLMService,
+        llm_scheduler: LLMScheduler,
         whisper_service: WhisperService,
         openaudio_service: OpenAudioService,
     ) -> None:
-        self._llm_service = llm_service
+        self._llm_scheduler = llm_scheduler
         self._whisper_service = whisper_service
         self._openaudio_service = openaudio_service
 
     async def run_dialogue(
         self,
         *,
-        audio_bytes: bytes,
+        audio_bytes: AudioInput,
         filename: str,
         content_type: Optional[str],
         instructions: Optional[str],
@@ -73,20 +75,20 @@ class ConversationService:
             )
 
             prompt = self._build_prompt(transcription_text=transcription.text, instructions=instructions)
-            generation_request = self._build_generation_request(
+            generation_params = self._build_generation_params(
                 prompt=prompt, overrides=generation_overrides or {}
             )
-
-            generation_params = generation_request.model_dump(exclude_unset=True)
-            llm_model = self._llm_service.model
             llm_start = time.perf_counter()
+            # Share the scheduler with the generation endpoints so llama.cpp is never re-entered.
+            sequence = self._llm_scheduler.submit(generation_params)
             try:
-                response_payload = await asyncio.to_thread(llm_model, **generation_params)
+                response_text = await sequence.text()
             except Exception:
                 record_external_call("llm_generation", time.perf_counter() - llm_start, success=False)
                 raise
+            finally:
+                sequence.cancel()
             record_external_call("llm_generation", time.perf_counter() - llm_start, success=True)
-            response_text = response_payload["choices"][0]["text"]
 
             synthesis_kwargs = self._prepare_synthesis_kwargs(synthesis_overrides or {})
 
@@ -129,13 +131,31 @@ class ConversationService:
             return f"{instructions_clean}\n\nUser: {user_text}\nAssistant:"
         return f"User: {user_text}\nAssistant:"
 
+    @classmethod
+    def _build_generation_params(cls, *, prompt: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Return llama.cpp keyword arguments for ``prompt`` and the client's overrides.
+
+        Only explicitly set fields are forwarded, so without overrides the request
+        model is bypassed and the arguments are just the prompt.
+        """
+
+        if not overrides:
+            return {"prompt": prompt}
+        return cls._build_generation_request(prompt=prompt, overrides=overrides).to_llama_kwargs()
+
     @staticmethod
     def _build_generation_request(
         *, prompt: str, overrides: Dict[str, Any]
     ) -> GenerationRequest:
-        """Merge overrides with the default :class:`GenerationRequest` schema."""
+        """Merge overrides with the default :class:`GenerationRequest` schema.
+
+        Overrides come from the client and are always validated; without any, the
+        defaults are already known to be valid and validation is skipped.
+        """
 
         sanitized = {k: v for k, v in overrides.items() if v is not None and k != "prompt"}
+        if not sanitized:
+            return GenerationRequest.model_construct(prompt=prompt)
         try:
             return GenerationRequest(prompt=prompt, **sanitized)
         except Exception as exc:  # pragma: no cover - validation error surfaces upstream
@@ -145,10 +165,11 @@ class ConversationService:
     def _prepare_synthesis_kwargs(overrides: Dict[str, Any]) -> Dict[str, Any]:
         """Remove disallowed keys and ``None`` values from synthesis overrides."""
 
-        filtered = {
+        if not overrides:
+            return {}
+        return {
             key: value
             for key, value in overrides.items()
-            if key not in {"text", "stream"} and value is not None
+            if value is not None and key not in _SYNTHESIS_RESERVED_KEYS
         }
-        return filtered
 
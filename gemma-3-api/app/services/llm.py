@@ -3,23 +3,98 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 
 from huggingface_hub import hf_hub_download
-from llama_cpp import Llama
+from huggingface_hub.utils import LocalEntryNotFoundError
 
 from app.config.settings import Settings
 
+if TYPE_CHECKING:
+    from llama_cpp import Llama
+
 logger = logging.getLogger(__name__)
 
 
+def _import_llama_cpp(n_threads: int) -> ModuleType:
+    """Import ``llama_cpp`` with OpenMP's thread pool sized to ``n_threads``.
+
+    libgomp reads ``OMP_NUM_THREADS`` once, when the shared library is loaded, so it
+    must be set before the first import; otherwise OpenMP sizes its pool to every core
+    and oversubscribes alongside llama.cpp's own threads. An explicit value wins.
+    """
+
+    os.environ.setdefault("OMP_NUM_THREADS", str(n_threads))
+    import llama_cpp
+
+    return llama_cpp
+
+
+@dataclass(frozen=True, slots=True)
+class LlamaLoadConfig:
+    """llama.cpp constructor options derived once from :class:`Settings`."""
+
+    n_gpu_layers: int
+    n_batch: int
+    n_threads: int
+    n_ctx: int
+    use_mlock: bool = False
+    lora_path: Optional[str] = None
+    lora_scale: float = 1.0
+    prompt_cache_bytes: int = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "LlamaLoadConfig":
+        return cls(
+            n_gpu_layers=settings.llm_gpu_layers,
+            n_batch=settings.llm_batch_size,
+            n_threads=settings.llm_n_threads,
+            n_ctx=settings.llm_context_size,
+            use_mlock=settings.llm_use_mlock,
+            lora_path=settings.llm_lora_path,
+            lora_scale=settings.llm_lora_scale,
+            prompt_cache_bytes=settings.llm_prompt_cache_bytes,
+        )
+
+    def to_kwargs(self, model_path: str) -> Dict[str, Any]:
+        """Return keyword arguments for :class:`llama_cpp.Llama`."""
+
+        kwargs: Dict[str, Any] = {
+            "model_path": model_path,
+            "n_gpu_layers": self.n_gpu_layers,
+            "n_batch": self.n_batch,
+            "n_threads": self.n_threads,
+            # llama-cpp-python otherwise sizes the prefill pool to every core, which
+            # oversubscribes the CPU alongside the pinned OpenMP pool.
+            "n_threads_batch": self.n_threads,
+            "n_ctx": self.n_ctx,
+            # Weights stay in the page cache across restarts instead of being copied in.
+            "use_mmap": True,
+            "use_mlock": self.use_mlock,
+            "offload_kqv": True,
+            "verbose": False,
+        }
+        if self.lora_path:
+            kwargs["lora_path"] = self.lora_path
+            kwargs["lora_scale"] = self.lora_scale
+        return kwargs
+
+
 class LLMService:
     """Lifecycle manager for the Gemma llama.cpp model."""
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
+        self._load_config = LlamaLoadConfig.from_settings(settings)
         self._llm: Optional[Llama] = None
         self._model_path: Optional[str] = None
+        # llama.cpp contexts are not thread-safe; worker threads serialise on this lock.
+        self.inference_lock = threading.Lock()
 
     def startup(self) -> None:
         """Download and load the configured model if required."""
@@ -28,31 +103,57 @@ class LLMService:
             logger.debug("LLMService.startup invoked but model already loaded")
             return
 
-        logger.info(
-            "Downloading model '%s' from repo '%s'...",
-            self._settings.llm_model_filename,
-            self._settings.llm_repo_id,
-        )
-
-        self._model_path = hf_hub_download(
-            repo_id=self._settings.llm_repo_id,
-            filename=self._settings.llm_model_filename,
-            token=self._settings.hugging_face_hub_token,
-        )
-
-        logger.info("Model downloaded to: %s", self._model_path)
+        self._model_path = self._resolve_model_path()
         logger.info("Loading model into memory via llama.cpp...")
 
-        self._llm = Llama(
-            model_path=self._model_path,
-            n_gpu_layers=self._settings.llm_gpu_layers,
-            n_batch=self._settings.llm_batch_size,
-            n_threads=self._settings.llm_n_threads,
-            n_ctx=self._settings.llm_context_size,
-            verbose=True,
-        )
+        if self._load_config.lora_path:
+            logger.info("Applying LoRA adapter from %s", self._load_config.lora_path)
+
+        llama_cpp = _import_llama_cpp(self._load_config.n_threads)
+        self._llm = llama_cpp.Llama(**self._load_config.to_kwargs(self._model_path))
+        if self._load_config.prompt_cache_bytes:
+            # Keeps KV state for recent prompts so shared prefixes skip prefill.
+            logger.info(
+                "Enabling llama.cpp prompt cache (%d bytes)", self._load_config.prompt_cache_bytes
+            )
+            self._llm.set_cache(
+                llama_cpp.LlamaRAMCache(capacity_bytes=self._load_config.prompt_cache_bytes)
+            )
 
         logger.info("Model loaded successfully.")
+        self._warm_up()
+
+    def _warm_up(self) -> None:
+        """Run a one-token generation so backend initialisation is not paid by the first request."""
+
+        assert self._llm is not None
+        start = time.perf_counter()
+        try:
+            self._llm("warm", max_tokens=1, temperature=0.0)
+        except Exception:  # pragma: no cover - warm-up is best effort
+            logger.warning("Model warm-up failed; continuing without it", exc_info=True)
+            return
+        logger.info("Model warm-up completed in %.1f ms", (time.perf_counter() - start) * 1000)
+
+    def _resolve_model_path(self) -> str:
+        """Return the cached GGUF path, downloading it only when it is not cached yet."""
+
+        repo_id = self._settings.llm_repo_id
+        filename = self._settings.llm_model_filename
+        try:
+            # Skips the ETag round-trip to the Hub on warm starts and when offline.
+            model_path = hf_hub_download(repo_id=repo_id, filename=filename, local_files_only=True)
+        except LocalEntryNotFoundError:
+            logger.info("Downloading model '%s' from repo '%s'...", filename, repo_id)
+            model_path = hf_hub_download(
+                repo_id=repo_id,
+                filename=filename,
+                token=self._settings.hugging_face_hub_token,
+            )
+            logger.info("Model downloaded to: %s", model_path)
+        else:
+            logger.info("Using cached model at: %s", model_path)
+        return model_path
 
     def shutdown(self) -> None:
         """Release model resources."""
@@ -68,3 +169,12 @@ class LLMService:
             raise RuntimeError("LLM model is not loaded")
         return self._llm
 
+    def tokenize_batch(self, texts: Sequence[str], *, add_bos: bool = True) -> List[List[int]]:
+        """Tokenize several prompts in a single pass over the loaded vocabulary.
+
+        Tokenization only reads the vocabulary and never touches the KV cache, so it runs
+        without ``inference_lock`` instead of queueing behind a whole generation.
+        """
+
+        model = self.model
+        return [model.tokenize(text.encode("utf-8"), add_bos=add_bos) for text in texts]
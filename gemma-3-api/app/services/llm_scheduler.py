@@ -0,0 +1,214 @@
+"""Request scheduler that feeds llama.cpp generations from a dedicated worker."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.services.llm import LLMService
+
+logger = logging.getLogger(__name__)
+
+_STREAM_END = object()
+
+# Token batches are flushed once this many tokens accumulate or the interval elapses.
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_INTERVAL_SECONDS = 0.005
+
+
+class SequenceHandle:
+    """Asynchronous view over the tokens produced for one scheduled generation."""
+
+    def __init__(
+        self,
+        generation_params: Dict[str, Any],
+        loop: asyncio.AbstractEventLoop,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_interval: float = DEFAULT_BATCH_INTERVAL_SECONDS,
+    ) -> None:
+        self.generation_params = generation_params
+        self._loop = loop
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+        self._queue: asyncio.Queue[object] = asyncio.Queue()
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Ask the scheduler to stop producing tokens for this sequence."""
+
+        self._cancelled.set()
+
+    def emit(self, item: object) -> None:
+        """Deliver a token, exception or end marker from the worker thread."""
+
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    def finish(self) -> None:
+        self.emit(_STREAM_END)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        """Yield tokens one at a time as the worker produces them."""
+
+        while True:
+            item = await self._queue.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item  # type: ignore[misc]
+
+    async def batches(
+        self,
+        *,
+        max_tokens: Optional[int] = None,
+        max_delay: Optional[float] = None,
+    ) -> AsyncIterator[List[str]]:
+        """Yield token batches once ``max_tokens`` accumulate or ``max_delay`` elapses.
+
+        Both limits default to the values the scheduler was configured with.
+        """
+
+        if max_tokens is None:
+            max_tokens = self._batch_size
+        if max_delay is None:
+            max_delay = self._batch_interval
+        loop = self._loop
+        queue = self._queue
+        finished = False
+        while not finished:
+            item = await queue.get()
+            buffer: List[str] = []
+            # One timer per batch rather than per token: tokens already queued are taken
+            # without suspending, and the loop only waits when the worker is behind.
+            try:
+                async with asyncio.timeout_at(loop.time() + max_delay):
+                    while True:
+                        if item is _STREAM_END:
+                            finished = True
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+                        buffer.append(item)  # type: ignore[arg-type]
+                        if len(buffer) >= max_tokens:
+                            break
+                        try:
+                            item = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            item = await queue.get()
+            except TimeoutError:
+                pass
+            if buffer:
+                yield buffer
+
+    async def text(self) -> str:
+        """Wait for the sequence to complete and return the full generated text."""
+
+        return "".join([token async for token in self])
+
+
+class LLMScheduler:
+    """Admit generation requests in arrival order and run them on one worker thread.
+
+    llama-cpp-python's high-level ``Llama`` object owns a single KV sequence, so
+    sequences are decoded one after another. Keeping admission in one place lets
+    requests queue without each holding a thread, and skips work for clients that
+    disconnected while waiting.
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_interval: float = DEFAULT_BATCH_INTERVAL_SECONDS,
+    ) -> None:
+        self._llm_service = llm_service
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+        self._pending: Optional[asyncio.Queue[SequenceHandle]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._active: Optional[SequenceHandle] = None
+
+    async def startup(self) -> None:
+        """Start the scheduling loop."""
+
+        if self._task is not None:
+            return
+        self._pending = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-scheduler")
+        self._task = asyncio.create_task(self._run(), name="llm-scheduler")
+        logger.info("LLM scheduler started")
+
+    async def shutdown(self) -> None:
+        """Stop the scheduling loop and fail any sequences still waiting."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._active is not None:
+            self._active.cancel()
+        assert self._pending is not None
+        while not self._pending.empty():
+            handle = self._pending.get_nowait()
+            handle.emit(RuntimeError("LLM scheduler stopped"))
+            handle.finish()
+        self._pending = None
+
+        assert self._executor is not None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def submit(self, generation_params: Dict[str, Any]) -> SequenceHandle:
+        """Queue a generation request and return a handle streaming its tokens."""
+
+        if self._pending is None:
+            raise RuntimeError("LLM scheduler is not running")
+        handle = SequenceHandle(
+            generation_params,
+            asyncio.get_running_loop(),
+            batch_size=self._batch_size,
+            batch_interval=self._batch_interval,
+        )
+        self._pending.put_nowait(handle)
+        return handle
+
+    async def _run(self) -> None:
+        assert self._pending is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            handle = await self._pending.get()
+            if handle.cancelled:
+                handle.finish()
+                continue
+            self._active = handle
+            try:
+                await loop.run_in_executor(self._executor, self._generate, handle)
+            finally:
+                self._active = None
+
+    def _generate(self, handle: SequenceHandle) -> None:
+        try:
+            with self._llm_service.inference_lock:
+                for chunk in self._llm_service.model(**handle.generation_params, stream=True):
+                    if handle.cancelled:
+                        break
+                    handle.emit(chunk["choices"][0]["text"])
+        except Exception as exc:  # pragma: no cover - llama.cpp errors
+            handle.emit(exc)
+        finally:
+            handle.finish()
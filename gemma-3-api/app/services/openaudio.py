@@ -3,33 +3,98 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import hashlib
 import logging
+import random
 import time
-from dataclasses import dataclass
-from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
 
 import httpx
+import msgspec
 
 from app.config.settings import Settings
 from app.observability.metrics import record_external_call
+from app.utils.b64 import b64decode, b64encode_str
+from app.utils.json import dumps, loads
 
 logger = logging.getLogger(__name__)
 
 
+_MEDIA_TYPES = {
+    "pcm": "audio/pcm",
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+    "flac": "audio/flac",
+}
+
+
+# Bounds for the jittered delay between streaming retries.
+_RETRY_BACKOFF_BASE_SECONDS = 0.5
+_RETRY_BACKOFF_CAP_SECONDS = 10.0
+
+# Idle pooled connections are closed after this long; TTS requests tend to arrive in
+# bursts, so keep them around longer than httpx's 5 second default.
+_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# JSON envelopes at least this large are decoded in a worker thread; below it the
+# thread hand-off costs more than parsing on the event loop.
+_THREAD_DECODE_MIN_BYTES = 256 * 1024
+
+
+# Upper bound on the buffer allocated from an upstream Content-Length before any data
+# arrives; larger bodies grow the buffer as they are read.
+_PREALLOCATE_MAX_BYTES = 16 * 1024 * 1024
+
+
 def _media_type_for_format(response_format: str) -> str:
-    mapping = {
-        "pcm": "audio/pcm",
-        "wav": "audio/wav",
-        "mp3": "audio/mpeg",
-        "ogg": "audio/ogg",
-        "flac": "audio/flac",
-    }
-    return mapping.get(response_format.lower(), "application/octet-stream")
-
-
-@dataclass(slots=True)
-class OpenAudioSynthesisResult:
+    return _MEDIA_TYPES.get(response_format.lower(), "application/octet-stream")
+
+
+async def _read_body(response: httpx.Response) -> bytearray:
+    """Read a streamed response body into a single buffer.
+
+    When the length is declared up front the buffer is allocated once (up to
+    ``_PREALLOCATE_MAX_BYTES``) and filled in place, so unlike ``aread`` the chunks and
+    their joined copy never coexist. Bodies that disagree with the declared length are
+    rejected rather than truncated or padded.
+    """
+
+    declared = response.headers.get("content-length", "")
+    if "content-encoding" in response.headers or not declared.isdigit():
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+        return body
+
+    length = int(declared)
+    body = bytearray(min(length, _PREALLOCATE_MAX_BYTES))
+    filled = 0
+    # Without a content encoding there is nothing to decode, so read the raw stream.
+    async for chunk in response.aiter_raw():
+        end = filled + len(chunk)
+        if end > length:
+            raise httpx.RemoteProtocolError("OpenAudio response exceeds its Content-Length")
+        # Writing at or past the end of the buffer extends it.
+        body[filled:end] = chunk
+        filled = end
+    if filled != length:
+        raise httpx.RemoteProtocolError("OpenAudio response is shorter than its Content-Length")
+    return body
+
+
+def _decode_json_envelope(body: bytes | bytearray) -> Tuple[bytes, Dict[str, Any]]:
+    """Parse a JSON synthesis response, returning the decoded audio and the envelope."""
+
+    data = loads(body)
+    audio_b64 = data.get("audio") or data.get("audio_base64")
+    if not audio_b64:
+        raise RuntimeError("OpenAudio response missing audio payload")
+    return b64decode(audio_b64), data
+
+
+class OpenAudioSynthesisResult(msgspec.Struct, frozen=True):
     """Blocking synthesis payload."""
 
     audio: bytes
@@ -39,11 +104,10 @@ class OpenAudioSynthesisResult:
     media_type: str
 
     def as_base64(self) -> str:
-        return base64.b64encode(self.audio).decode("ascii")
+        return b64encode_str(self.audio)
 
 
-@dataclass(slots=True)
-class OpenAudioSynthesisStream:
+class OpenAudioSynthesisStream(msgspec.Struct, frozen=True):
     """Streaming synthesis payload."""
 
     iterator_factory: Callable[[], AsyncIterator[bytes]]
@@ -53,6 +117,31 @@ class OpenAudioSynthesisStream:
     media_type: str
 
 
+class _ResultCache:
+    """Byte-bounded LRU of blocking synthesis results, keyed by request digest."""
+
+    def __init__(self, capacity_bytes: int) -> None:
+        self._capacity_bytes = capacity_bytes
+        self._size_bytes = 0
+        self._entries: OrderedDict[bytes, OpenAudioSynthesisResult] = OrderedDict()
+
+    def get(self, key: bytes) -> Optional[OpenAudioSynthesisResult]:
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: bytes, result: OpenAudioSynthesisResult) -> None:
+        size = len(result.audio)
+        if size > self._capacity_bytes or key in self._entries:
+            return
+        self._entries[key] = result
+        self._size_bytes += size
+        while self._size_bytes > self._capacity_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted.audio)
+
+
 class OpenAudioService:
     """Adapter used to interact with a running OpenAudio deployment."""
 
@@ -60,18 +149,53 @@ class OpenAudioService:
         self._settings = settings
         self._client: Optional[httpx.AsyncClient] = None
         self._client_lock = asyncio.Lock()
+        # Settings are frozen, so the endpoint path can be resolved once.
+        self._tts_path = settings.openaudio_tts_path
+        # Settings-derived payload fields, copied per request and then overridden.
+        self._base_payload: Dict[str, Any] = {
+            "format": settings.openaudio_default_format,
+            "streaming": False,
+            "normalize": settings.openaudio_default_normalize,
+        }
+        if settings.openaudio_default_reference_id:
+            self._base_payload["reference_id"] = settings.openaudio_default_reference_id
+        self._result_cache = (
+            _ResultCache(settings.openaudio_result_cache_bytes)
+            if settings.openaudio_result_cache_bytes
+            else None
+        )
+        # Shared by every request; callers copy it before adding per-request headers.
+        # Payloads are pre-encoded with orjson, so the content type is set explicitly.
+        # Audio codecs are already compressed; asking for identity keeps the server from
+        # gzipping them again and lets responses be read with ``aiter_raw``.
+        self._json_headers: Dict[str, str] = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": "identity",
+        }
+        if settings.openaudio_api_key:
+            self._json_headers["Authorization"] = f"Bearer {settings.openaudio_api_key}"
 
     async def startup(self) -> None:
         """Initialise the HTTP client."""
 
-        timeout = httpx.Timeout(self._settings.openaudio_timeout_seconds)
+        settings = self._settings
+        timeout = httpx.Timeout(settings.openaudio_timeout_seconds)
+        limits = httpx.Limits(
+            max_connections=settings.openaudio_max_connections,
+            max_keepalive_connections=settings.openaudio_max_keepalive_connections,
+            keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+        )
         self._client = httpx.AsyncClient(
-            base_url=self._settings.openaudio_api_base,
+            base_url=settings.openaudio_api_base,
             timeout=timeout,
+            limits=limits,
+            http2=settings.openaudio_http2,
         )
         logger.info(
-            "Initialised OpenAudio client with timeout %.1fs",
-            self._settings.openaudio_timeout_seconds,
+            "Initialised OpenAudio client with timeout %.1fs (max %d connections, http2=%s)",
+            settings.openaudio_timeout_seconds,
+            settings.openaudio_max_connections,
+            settings.openaudio_http2,
         )
 
     async def shutdown(self) -> None:
@@ -99,7 +223,6 @@ class OpenAudioService:
     ) -> OpenAudioSynthesisResult:
         """Perform blocking TTS synthesis."""
 
-        client = await self._require_client()
         payload = self._build_payload(
             text=text,
             response_format=response_format,
@@ -109,71 +232,78 @@ class OpenAudioService:
             references=references,
             top_p=top_p,
         )
+        content = dumps(payload)
+        # The encoded payload covers every option that shapes the audio, so it doubles
+        # as the cache key for repeated phrases.
+        cache = self._result_cache
+        cache_key = b""
+        if cache is not None:
+            cache_key = hashlib.blake2b(content, digest_size=16).digest()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        headers = self._auth_headers()
-        logger.debug(
-            "Requesting OpenAudio synthesis: format=%s reference_id=%s",
-            payload.get("format"),
-            payload.get("reference_id"),
-        )
+        client = await self._require_client()
+
+        # Prefer raw audio over the JSON envelope: it is a quarter smaller on the wire
+        # and needs no base64 decode. JSON is still accepted and handled below.
+        headers = {
+            **self._json_headers,
+            "Accept": f"{_media_type_for_format(payload['format'])}, application/json;q=0.5",
+        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Requesting OpenAudio synthesis: format=%s reference_id=%s",
+                payload.get("format"),
+                payload.get("reference_id"),
+            )
         start = time.perf_counter()
         try:
-            response = await client.post(
-                self._settings.openaudio_tts_path,
-                json=payload,
+            async with client.stream(
+                "POST",
+                self._tts_path,
+                content=content,
                 headers=headers,
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
+                body = await _read_body(response)
         except httpx.HTTPError as exc:  # pragma: no cover - network failure
             logger.exception("OpenAudio synthesis failed")
             record_external_call("openaudio_synthesize", time.perf_counter() - start, success=False)
             raise RuntimeError("OpenAudio synthesis failed") from exc
 
         if response.headers.get("content-type", "").startswith("application/json"):
-            data = response.json()
-            audio_b64 = data.get("audio") or data.get("audio_base64")
-            if not audio_b64:
-                raise RuntimeError("OpenAudio response missing audio payload")
-            audio_bytes = base64.b64decode(audio_b64)
+            if len(body) >= _THREAD_DECODE_MIN_BYTES:
+                audio_bytes, data = await asyncio.to_thread(_decode_json_envelope, body)
+            else:
+                audio_bytes, data = _decode_json_envelope(body)
             response_format_val = data.get("format", payload.get("format"))
-            sample_rate_val = data.get("sample_rate") or payload.get(
-                "sample_rate", self._settings.default_audio_sample_rate
-            )
+            sample_rate_val = data.get("sample_rate") or payload.get("sample_rate")
         else:
-            audio_bytes = await response.aread()
+            # Results may be cached and shared between callers, so freeze the buffer.
+            audio_bytes = bytes(body)
             response_format_val = payload.get("format", self._settings.openaudio_default_format)
-            sample_rate_header = response.headers.get(
-                "x-sample-rate",
-                payload.get("sample_rate", self._settings.default_audio_sample_rate),
-            )
-            try:
-                sample_rate_val = int(sample_rate_header)
-            except (TypeError, ValueError):  # pragma: no cover - malformed headers
-                logger.warning(
-                    "Falling back to default sample rate due to malformed header: %s",
-                    sample_rate_header,
-                )
-                sample_rate_val = self._settings.default_audio_sample_rate
+            sample_rate_val = response.headers.get("x-sample-rate") or payload.get("sample_rate")
 
-        try:
-            sample_rate_int = int(sample_rate_val)
-        except (TypeError, ValueError):  # pragma: no cover - malformed payload
-            logger.warning(
-                "Invalid sample rate '%s' detected; defaulting to %s",
-                sample_rate_val,
-                self._settings.default_audio_sample_rate,
-            )
-            sample_rate_int = self._settings.default_audio_sample_rate
+        # JSON bodies and request payloads already carry ints; only headers need parsing.
+        sample_rate_int = (
+            sample_rate_val
+            if isinstance(sample_rate_val, int)
+            else self._coerce_sample_rate(sample_rate_val)
+        )
 
         record_external_call("openaudio_synthesize", time.perf_counter() - start, success=True)
 
-        return OpenAudioSynthesisResult(
+        result = OpenAudioSynthesisResult(
             audio=audio_bytes,
             response_format=response_format_val,
             sample_rate=sample_rate_int,
             reference_id=payload.get("reference_id"),
             media_type=_media_type_for_format(response_format_val),
         )
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
 
     async def synthesize_stream(
         self,
@@ -199,25 +329,36 @@ class OpenAudioService:
             top_p=top_p,
         )
         payload["streaming"] = True
-        headers = self._auth_headers()
+        # Encoded once and reused by every retry attempt.
+        content = dumps(payload)
+        headers = self._json_headers
+        chunk_size = self._settings.openaudio_stream_chunk_bytes or None
 
         async def iterator() -> AsyncIterator[bytes]:
             retries = self._settings.openaudio_max_retries
             attempt = 0
+            backoff = _RETRY_BACKOFF_BASE_SECONDS
             while True:
                 attempt += 1
                 try:
                     start = time.perf_counter()
                     async with client.stream(
                         "POST",
-                        self._settings.openaudio_tts_path,
-                        json=payload,
+                        self._tts_path,
+                        content=content,
                         headers=headers,
                     ) as response:
                         response.raise_for_status()
-                        async for chunk in response.aiter_bytes():
-                            if chunk:
-                                yield chunk
+                        # Skip httpx's decoder stage unless the server encoded the body
+                        # despite the identity request.
+                        chunks = (
+                            response.aiter_bytes
+                            if "content-encoding" in response.headers
+                            else response.aiter_raw
+                        )
+                        # httpx never yields empty chunks, so no per-chunk guard is needed.
+                        async for chunk in chunks(chunk_size=chunk_size):
+                            yield chunk
                     record_external_call("openaudio_stream", time.perf_counter() - start, success=True)
                     break
                 except httpx.HTTPError as exc:  # pragma: no cover - network instability
@@ -225,9 +366,14 @@ class OpenAudioService:
                     if attempt > retries:
                         logger.exception("Streaming synthesis failed after %s attempts", attempt)
                         raise RuntimeError("OpenAudio streaming synthesis failed") from exc
-                    backoff = min(2 ** attempt, 10)
+                    # Decorrelated jitter: concurrent streams retrying after an upstream
+                    # restart spread out instead of reconnecting in lockstep.
+                    backoff = min(
+                        _RETRY_BACKOFF_CAP_SECONDS,
+                        random.uniform(_RETRY_BACKOFF_BASE_SECONDS, backoff * 3),
+                    )
                     logger.warning(
-                        "Streaming synthesis error (attempt %s/%s), retrying in %ss",
+                        "Streaming synthesis error (attempt %s/%s), retrying in %.2fs",
                         attempt,
                         retries,
                         backoff,
@@ -245,17 +391,26 @@ class OpenAudioService:
         )
 
     async def _require_client(self) -> httpx.AsyncClient:
+        # Only the first call after startup/shutdown needs the lock; the event loop is
+        # single threaded, so an initialised client cannot be torn down mid-check.
+        client = self._client
+        if client is not None:
+            return client
         async with self._client_lock:
             if self._client is None:
                 await self.startup()
             assert self._client is not None
             return self._client
 
-    def _auth_headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {}
-        if self._settings.openaudio_api_key:
-            headers["Authorization"] = f"Bearer {self._settings.openaudio_api_key}"
-        return headers
+    def _coerce_sample_rate(self, value: Any) -> int:
+        default = self._settings.default_audio_sample_rate
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            logger.warning("Invalid sample rate '%s' detected; defaulting to %s", value, default)
+            return default
 
     def _build_payload(
         self,
@@ -268,21 +423,16 @@ class OpenAudioService:
         references: Optional[Sequence[str]],
         top_p: Optional[float],
     ) -> Dict[str, Any]:
-        payload: Dict[str, Any] = {
-            "text": text,
-            "format": response_format or self._settings.openaudio_default_format,
-            "streaming": False,
-        }
-
-        chosen_reference = reference_id or self._settings.openaudio_default_reference_id
-        if chosen_reference:
-            payload["reference_id"] = chosen_reference
+        payload = self._base_payload.copy()
+        payload["text"] = text
+        if response_format:
+            payload["format"] = response_format
+        if reference_id:
+            payload["reference_id"] = reference_id
         if sample_rate is not None:
             payload["sample_rate"] = sample_rate
         if normalize is not None:
             payload["normalize"] = normalize
-        else:
-            payload["normalize"] = self._settings.openaudio_default_normalize
         if references:
             payload["references"] = list(references)
         if top_p is not None:
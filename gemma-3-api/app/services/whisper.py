@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
+import io
 import logging
+import operator
+import os
+import shutil
 import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 
 from app.config.settings import Settings
 from app.observability.metrics import record_external_call
+from app.utils.json import dumps, loads
+from app.services.whisper_batcher import MAX_BATCH_SAMPLES, SAMPLE_RATE, WhisperBatcher
 
 try:  # pragma: no cover - optional dependency
     from openai import AsyncOpenAI
@@ -20,8 +31,45 @@ except ImportError:  # pragma: no cover - handled gracefully at runtime
     AsyncOpenAI = None  # type: ignore[assignment]
     OpenAIAPIError = Exception  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional dependency
+    import soundfile
+except ImportError:  # pragma: no cover - local clips then always go through ffmpeg
+    soundfile = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# AsyncOpenAI clients keyed by (api_key, base_url, timeout), with the number of services
+# holding each. Services with the same configuration share one connection pool, and the
+# last one to shut down closes it.
+_ClientKey = Tuple[str, Optional[str], float]
+_shared_clients: Dict[_ClientKey, Tuple[Any, int]] = {}
+
+
+def _acquire_client(key: _ClientKey) -> Any:
+    entry = _shared_clients.get(key)
+    if entry is None:
+        api_key, base_url, timeout = key
+        entry = (AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout), 0)
+    client, holders = entry
+    _shared_clients[key] = (client, holders + 1)
+    return client
+
+
+async def _release_client(key: _ClientKey) -> None:
+    entry = _shared_clients.get(key)
+    if entry is None:
+        return
+    client, holders = entry
+    if holders > 1:
+        _shared_clients[key] = (client, holders - 1)
+        return
+    del _shared_clients[key]
+    await client.close()
+
+
+# Audio can be supplied as raw bytes or as a readable binary file (e.g. a spooled upload).
+AudioInput = Union[bytes, BinaryIO]
+
 
 @dataclass(slots=True)
 class WhisperTranscriptionSegment:
@@ -33,6 +81,10 @@ class WhisperTranscriptionSegment:
     text: str
 
 
+# Positional order of WhisperTranscriptionSegment's fields.
+_segment_fields = operator.itemgetter("id", "start", "end", "text")
+
+
 @dataclass(slots=True)
 class WhisperTranscription:
     """Container returned by the Whisper service."""
@@ -44,32 +96,100 @@ class WhisperTranscription:
     @classmethod
     def from_dict(cls, payload: Dict[str, Any]) -> "WhisperTranscription":
         segments_data = payload.get("segments") or []
-        segments = [
-            WhisperTranscriptionSegment(
-                id=segment.get("id"),
-                start=segment.get("start"),
-                end=segment.get("end"),
-                text=segment.get("text", ""),
-            )
-            for segment in segments_data
-        ]
+        try:
+            # Whisper always emits all four keys; itemgetter pulls them in one C call.
+            segments = [
+                WhisperTranscriptionSegment(*_segment_fields(segment)) for segment in segments_data
+            ]
+        except KeyError:
+            segments = [
+                WhisperTranscriptionSegment(
+                    id=segment.get("id"),
+                    start=segment.get("start"),
+                    end=segment.get("end"),
+                    text=segment.get("text", ""),
+                )
+                for segment in segments_data
+            ]
         return cls(text=payload.get("text", ""), language=payload.get("language"), segments=segments)
 
 
+# Buffers at least this large are hashed in a worker thread; smaller ones hash faster
+# than the thread hand-off.
+_THREAD_DIGEST_MIN_BYTES = 1 << 20
+
+# (audio digest, language, prompt, temperature, response_format)
+_CacheKey = Tuple[bytes, Optional[str], Optional[str], Optional[float], Optional[str]]
+
+
+class _TranscriptionCache:
+    """LRU of recent transcriptions, each expiring ``ttl_seconds`` after it was stored."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[_CacheKey, Tuple[float, WhisperTranscription]] = OrderedDict()
+
+    def get(self, key: _CacheKey) -> Optional[WhisperTranscription]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, transcription = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return transcription
+
+    def put(self, key: _CacheKey, transcription: WhisperTranscription) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, transcription)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
 class WhisperService:
     """High-level speech-to-text adapter supporting remote and local inference."""
 
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._client: Optional[AsyncOpenAI] = None
+        self._client_key: Optional[_ClientKey] = None
         self._local_model: Any | None = None
         self._local_model_lock = asyncio.Lock()
+        self._batcher: Optional[WhisperBatcher] = None
+        # Local model calls run on a dedicated pool (see ``_model_executor``) so further
+        # requests queue here instead of contending for the model.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Settings-derived remote request fields, copied per call and then overridden.
+        self._remote_request_base: Dict[str, Any] = {
+            "model": settings.openai_whisper_model,
+            "response_format": settings.openai_whisper_response_format,
+        }
+        self._transcription_cache = (
+            _TranscriptionCache(settings.whisper_cache_size, settings.whisper_cache_ttl_seconds)
+            if settings.whisper_cache_size
+            else None
+        )
 
     async def startup(self) -> None:
         """Initialise the configured Whisper backend."""
 
         if self._settings.enable_local_whisper:
             await self._load_local_model()
+            if (
+                self._settings.local_whisper_batch_size > 1
+                and self._settings.local_whisper_backend == "openai-whisper"
+            ):
+                self._batcher = WhisperBatcher(
+                    self._local_model,
+                    max_batch_size=self._settings.local_whisper_batch_size,
+                    max_wait=self._settings.local_whisper_batch_wait_ms / 1000,
+                    # Batches share the model's executor so they never overlap the
+                    # ``transcribe`` calls made for long clips or the ffmpeg fallback.
+                    executor=self._model_executor(),
+                )
+                await self._batcher.startup()
             return
 
         if self._settings.openai_api_key is None:
@@ -79,17 +199,25 @@ class WhisperService:
         if AsyncOpenAI is None:  # pragma: no cover - dependency is optional
             raise RuntimeError("The 'openai' package is required for remote Whisper usage.")
 
+        if self._client is not None:
+            return
         timeout = self._settings.openai_timeout_seconds
-        self._client = AsyncOpenAI(
-            api_key=self._settings.openai_api_key,
-            base_url=self._settings.openai_api_base,
-            timeout=timeout,
-        )
+        self._client_key = (self._settings.openai_api_key, self._settings.openai_api_base, timeout)
+        self._client = _acquire_client(self._client_key)
         logger.info("Initialised AsyncOpenAI Whisper client with timeout %.1fs", timeout)
 
     async def shutdown(self) -> None:
         """Release any allocated resources."""
 
+        if self._batcher is not None:
+            await self._batcher.shutdown()
+            self._batcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._client_key is not None:
+            await _release_client(self._client_key)
+            self._client_key = None
         self._client = None
         self._local_model = None
 
@@ -101,7 +229,7 @@ class WhisperService:
 
     async def transcribe(
         self,
-        audio_bytes: bytes,
+        audio_bytes: AudioInput,
         *,
         filename: str,
         content_type: Optional[str] = None,
@@ -110,8 +238,60 @@ class WhisperService:
         response_format: Optional[str] = None,
         temperature: Optional[float] = None,
     ) -> WhisperTranscription:
-        """Transcribe the provided audio payload."""
+        """Transcribe the provided audio payload.
+
+        When ``WHISPER_CACHE_SIZE`` is set, greedy (temperature 0 or default) transcriptions
+        are cached by audio digest and options, so a retried upload of the same clip is
+        answered without the model.
+        """
+
+        cache = self._transcription_cache
+        if cache is None or temperature:
+            return await self._transcribe_uncached(
+                audio_bytes,
+                filename=filename,
+                content_type=content_type,
+                language=language,
+                prompt=prompt,
+                response_format=response_format,
+                temperature=temperature,
+            )
+
+        if (
+            isinstance(audio_bytes, (bytes, bytearray, memoryview))
+            and len(audio_bytes) < _THREAD_DIGEST_MIN_BYTES
+        ):
+            digest = _audio_digest(audio_bytes)
+        else:
+            # hashlib releases the GIL, so large clips and spooled uploads hash off the loop.
+            digest = await asyncio.to_thread(_audio_digest, audio_bytes)
+        key = (digest, language, prompt, temperature, response_format)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        transcription = await self._transcribe_uncached(
+            audio_bytes,
+            filename=filename,
+            content_type=content_type,
+            language=language,
+            prompt=prompt,
+            response_format=response_format,
+            temperature=temperature,
+        )
+        cache.put(key, transcription)
+        return transcription
 
+    async def _transcribe_uncached(
+        self,
+        audio_bytes: AudioInput,
+        *,
+        filename: str,
+        content_type: Optional[str],
+        language: Optional[str],
+        prompt: Optional[str],
+        response_format: Optional[str],
+        temperature: Optional[float],
+    ) -> WhisperTranscription:
         if self._settings.enable_local_whisper:
             start = time.perf_counter()
             try:
@@ -130,12 +310,10 @@ class WhisperService:
         if self._client is None:
             raise RuntimeError("Whisper remote backend is not configured.")
 
-        file_tuple = (filename, audio_bytes, content_type or "application/octet-stream")
-        request_kwargs: Dict[str, Any] = {
-            "model": self._settings.openai_whisper_model,
-            "file": file_tuple,
-            "response_format": response_format or self._settings.openai_whisper_response_format,
-        }
+        request_kwargs = self._remote_request_base.copy()
+        request_kwargs["file"] = (filename, audio_bytes, content_type or "application/octet-stream")
+        if response_format:
+            request_kwargs["response_format"] = response_format
         if language:
             request_kwargs["language"] = language
         if prompt:
@@ -160,23 +338,65 @@ class WhisperService:
     async def _load_local_model(self) -> None:
         """Load Whisper locally in a background thread."""
 
-        try:
-            import whisper  # type: ignore
-        except ImportError as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError(
-                "Local Whisper inference requested but the 'whisper' package is not installed."
-            ) from exc
+        if self._settings.local_whisper_backend == "faster-whisper":
+            load_model = self._faster_whisper_loader()
+        else:
+            try:
+                import whisper  # type: ignore
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "Local Whisper inference requested but the 'whisper' package is not installed."
+                ) from exc
+            load_model = whisper.load_model
+            safetensors_dir = self._settings.local_whisper_safetensors_dir
+            if safetensors_dir:
+                load_model = functools.partial(_load_whisper_safetensors, Path(safetensors_dir))
 
         model_name = self._settings.local_whisper_model
         async with self._local_model_lock:
             if self._local_model is not None:
                 return
-            logger.info("Loading local Whisper model '%s'", model_name)
-            self._local_model = await asyncio.to_thread(whisper.load_model, model_name)
+            logger.info(
+                "Loading local Whisper model '%s' (%s)",
+                model_name,
+                self._settings.local_whisper_backend,
+            )
+            self._local_model = await asyncio.to_thread(load_model, model_name)
+
+    def _faster_whisper_loader(self) -> Callable[[str], Any]:
+        try:
+            from faster_whisper import WhisperModel  # type: ignore
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "LOCAL_WHISPER_BACKEND=faster-whisper requires the 'faster-whisper' package."
+            ) from exc
+
+        # Each CTranslate2 worker decodes one clip at a time with the GIL released, so
+        # up to ``num_workers`` requests are transcribed concurrently on one model.
+        workers = self._settings.local_whisper_workers
+        compute_type = self._settings.local_whisper_compute_type or _default_compute_type()
+        logger.info("faster-whisper compute type: %s, workers: %d", compute_type, workers)
+        return functools.partial(WhisperModel, compute_type=compute_type, num_workers=workers)
+
+    def _model_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # openai-whisper installs its decoder KV-cache hooks on the shared model, so
+            # two concurrent decodes overwrite each other's cache; only CTranslate2 runs
+            # several transcriptions on one faster-whisper model safely.
+            workers = (
+                self._settings.local_whisper_workers
+                if self._settings.local_whisper_backend == "faster-whisper"
+                else 1
+            )
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper")
+        return self._executor
+
+    async def _run_model(self, call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        return await asyncio.get_running_loop().run_in_executor(self._model_executor(), call)
 
     async def _transcribe_locally(
         self,
-        audio_bytes: bytes,
+        audio_bytes: AudioInput,
         *,
         language: Optional[str],
         prompt: Optional[str],
@@ -189,9 +409,43 @@ class WhisperService:
 
         assert self._local_model is not None  # for type-checkers
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_file.write(audio_bytes)
-            tmp_path = Path(tmp_file.name)
+        if self._settings.local_whisper_backend == "faster-whisper":
+            # faster-whisper decodes and resamples in-process with PyAV, so the upload
+            # is handed over as a file object with no temp file or ffmpeg subprocess.
+            source = (
+                io.BytesIO(audio_bytes)
+                if isinstance(audio_bytes, (bytes, bytearray, memoryview))
+                else audio_bytes
+            )
+            transcribed = await self._run_model(
+                functools.partial(
+                    _transcribe_with_faster_whisper,
+                    self._local_model,
+                    source,
+                    language=language,
+                    prompt=prompt,
+                    temperature=temperature,
+                )
+            )
+            return WhisperTranscription.from_dict(transcribed)
+
+        # Clips already at Whisper's sample rate are decoded in-process; anything that
+        # needs resampling or an exotic codec still goes through ffmpeg via a temp file.
+        model_input: Any = await asyncio.to_thread(_decode_whisper_input, audio_bytes)
+        if (
+            self._batcher is not None
+            and model_input is not None
+            and len(model_input) <= MAX_BATCH_SAMPLES
+        ):
+            batched = await self._batcher.transcribe(
+                model_input, language=language, prompt=prompt, temperature=temperature
+            )
+            return WhisperTranscription.from_dict(batched)
+
+        tmp_path: Optional[Path] = None
+        if model_input is None:
+            tmp_path = await asyncio.to_thread(_write_temp_audio, audio_bytes)
+            model_input = str(tmp_path)
 
         try:
             kwargs: Dict[str, Any] = {}
@@ -204,11 +458,191 @@ class WhisperService:
 
             model_name = getattr(self._local_model, "model_name", "local-whisper")
             logger.debug("Dispatching Whisper transcription locally: model=%s", model_name)
-            result: Dict[str, Any] = await asyncio.to_thread(self._local_model.transcribe, str(tmp_path), **kwargs)
+            result: Dict[str, Any] = await self._run_model(
+                functools.partial(
+                    _transcribe_with_openai_whisper, self._local_model, model_input, **kwargs
+                )
+            )
         finally:
-            try:
-                tmp_path.unlink(missing_ok=True)
-            except OSError:  # pragma: no cover - best effort cleanup
-                logger.warning("Failed to remove temporary audio file at %s", tmp_path)
+            if tmp_path is not None:
+                try:
+                    tmp_path.unlink(missing_ok=True)
+                except OSError:  # pragma: no cover - best effort cleanup
+                    logger.warning("Failed to remove temporary audio file at %s", tmp_path)
 
         return WhisperTranscription.from_dict(result)
+
+
+def _load_whisper_safetensors(cache_dir: Path, name: str) -> Any:
+    """Load an openai-whisper model from a safetensors copy kept in ``cache_dir``.
+
+    The first load goes through ``whisper.load_model`` and writes the copy. Later loads
+    memory-map it straight onto the target device instead of unpickling the original
+    checkpoint into host memory and copying it across.
+    """
+
+    import torch  # type: ignore
+    import whisper  # type: ignore
+    from safetensors import safe_open  # type: ignore
+    from safetensors.torch import load_file, save_file  # type: ignore
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    path = cache_dir / f"{Path(name).name}.safetensors"
+    if not path.exists():
+        model = whisper.load_model(name, device=device)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        save_file(
+            {key: value.contiguous() for key, value in model.state_dict().items()},
+            str(tmp_path),
+            metadata={"dims": dumps(asdict(model.dims)).decode()},
+        )
+        os.replace(tmp_path, path)
+        logger.info("Saved Whisper weights to %s", path)
+        return model
+
+    with safe_open(str(path), framework="pt") as weights:
+        dims = whisper.model.ModelDimensions(**loads(weights.metadata()["dims"]))
+    # Building the module on the target device keeps its throwaway initial weights off
+    # the host; ``assign`` then swaps in the mapped tensors without another copy.
+    with torch.device(device):
+        model = whisper.model.Whisper(dims)
+    model.load_state_dict(load_file(str(path), device=device), assign=True)
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model
+
+
+def _default_compute_type() -> str:
+    """Pick reduced-precision weights for the available device.
+
+    float16 halves memory traffic on CUDA; int8 quarters it on CPU, where decoding is
+    bandwidth bound. Either costs well under a point of WER on the larger checkpoints.
+    """
+
+    import ctranslate2  # type: ignore
+
+    return "float16" if ctranslate2.get_cuda_device_count() else "int8"
+
+
+def _transcribe_with_faster_whisper(
+    model: Any,
+    audio: BinaryIO,
+    *,
+    language: Optional[str],
+    prompt: Optional[str],
+    temperature: Optional[float],
+) -> Dict[str, Any]:
+    """Run faster-whisper and return the result in openai-whisper's ``transcribe`` shape."""
+
+    kwargs: Dict[str, Any] = {"language": language or None, "initial_prompt": prompt or None}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    segments, info = model.transcribe(audio, **kwargs)
+    # ``segments`` is lazy and decoding happens while it is consumed, so drain it here
+    # in the worker thread rather than on the event loop.
+    segment_dicts = [
+        {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+        for segment in segments
+    ]
+    return {
+        "text": "".join(segment["text"] for segment in segment_dicts),
+        "language": info.language,
+        "segments": segment_dicts,
+    }
+
+
+def _decode_whisper_input(audio: AudioInput) -> Any | None:
+    """Decode a 16 kHz clip into the mono float32 array Whisper transcribes directly.
+
+    Returns ``None`` when soundfile is unavailable, cannot parse the container, or the
+    clip would need resampling; file objects are rewound so the caller can fall back.
+    """
+
+    if soundfile is None:
+        return None
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        source: BinaryIO = io.BytesIO(audio)
+        position = 0
+    else:
+        source = audio
+        position = audio.tell()
+
+    samples = None
+    try:
+        with soundfile.SoundFile(source) as sound:
+            if sound.samplerate == SAMPLE_RATE:
+                samples = sound.read(dtype="float32", always_2d=True)
+    except RuntimeError:
+        pass
+    if samples is None:
+        source.seek(position)
+        return None
+    # Downmix the same way ffmpeg's ``-ac 1`` does.
+    return samples[:, 0] if samples.shape[1] == 1 else samples.mean(axis=1, dtype="float32")
+
+
+# Per worker thread page-locked staging buffer for host-to-GPU audio copies, kept across
+# calls so each transcription skips the pinned allocation. Clips longer than this are
+# copied from pageable memory instead of growing the buffer without bound.
+_pinned = threading.local()
+_PINNED_MAX_SAMPLES = 10 * 60 * SAMPLE_RATE
+
+
+def _transcribe_with_openai_whisper(model: Any, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Run ``model.transcribe``, moving decoded clips onto a CUDA model's device first.
+
+    Whisper computes the log-mel spectrogram on whichever device holds the waveform, so
+    a GPU-resident clip also moves the STFT off the CPU.
+    """
+
+    device = getattr(model, "device", None)
+    if getattr(device, "type", None) == "cuda" and not isinstance(audio, str):
+        audio = _to_device(audio, device)
+    return model.transcribe(audio, **kwargs)
+
+
+def _to_device(audio: Any, device: Any) -> Any:
+    import torch  # type: ignore
+
+    samples = torch.from_numpy(audio)
+    if len(samples) > _PINNED_MAX_SAMPLES:
+        return samples.to(device)
+    buffer = getattr(_pinned, "buffer", None)
+    if buffer is None:
+        buffer = _pinned.buffer = torch.empty(
+            _PINNED_MAX_SAMPLES, dtype=torch.float32, pin_memory=True
+        )
+    # transcribe synchronises on its results before the thread's next call, so the
+    # asynchronous copy has always finished by the time the buffer is reused.
+    staged = buffer[: len(samples)]
+    staged.copy_(samples)
+    return staged.to(device, non_blocking=True)
+
+
+def _audio_digest(audio: AudioInput) -> bytes:
+    """Hash the audio payload, rewinding file objects so they can still be read.
+
+    OpenSSL's SHA-256 uses the SHA-NI instructions on current x86 CPUs, roughly
+    doubling BLAKE2b's throughput on multi-megabyte clips.
+    """
+
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(audio).digest()
+    position = audio.tell()
+    # file_digest reads into one reusable buffer instead of allocating per block.
+    digest = hashlib.file_digest(audio, "sha256").digest()
+    audio.seek(position)
+    return digest
+
+
+def _write_temp_audio(audio: AudioInput) -> Path:
+    """Persist audio to a temporary file, copying file objects in bounded chunks."""
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            tmp_file.write(audio)
+        else:
+            shutil.copyfileobj(audio, tmp_file)
+        return Path(tmp_file.name)
@@ -0,0 +1,183 @@
+"""Micro-batching of short local Whisper transcriptions onto one decoder pass."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Whisper decodes fixed 30 second mel windows, so only clips that fit a single window
+# can share a batch; every clip is padded to the full window regardless of length.
+SAMPLE_RATE = 16000
+MAX_BATCH_SAMPLES = 30 * SAMPLE_RATE
+
+# (language, prompt, temperature): clips are only batched with identical options.
+_DecodeKey = Tuple[Optional[str], Optional[str], Optional[float]]
+
+
+@dataclass(slots=True)
+class _PendingClip:
+    audio: Any
+    key: _DecodeKey
+    future: asyncio.Future[Dict[str, Any]]
+
+
+class WhisperBatcher:
+    """Collect concurrent short clips and decode them together on a worker thread.
+
+    ``model.transcribe`` handles one clip per call, leaving a GPU mostly idle under
+    concurrent load. Clips arriving within ``max_wait`` of each other are stacked into
+    one mel batch and run through ``whisper.decode`` once, up to ``max_batch_size``.
+
+    openai-whisper keeps decoder state on the model itself, so callers that also use
+    ``model`` elsewhere pass the single-worker ``executor`` serialising those calls;
+    without one the batcher creates and owns a private executor.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        *,
+        max_batch_size: int,
+        max_wait: float,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> None:
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._pending: Optional[asyncio.Queue[_PendingClip]] = None
+        self._shared_executor = executor
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def startup(self) -> None:
+        """Start the batching loop."""
+
+        if self._task is not None:
+            return
+        self._pending = asyncio.Queue()
+        self._executor = self._shared_executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="whisper-batcher"
+        )
+        self._task = asyncio.create_task(self._run(), name="whisper-batcher")
+        logger.info(
+            "Whisper batcher started (batch size %d, wait %.0f ms)",
+            self._max_batch_size,
+            self._max_wait * 1000,
+        )
+
+    async def shutdown(self) -> None:
+        """Stop the batching loop and fail any clips still waiting."""
+
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        assert self._pending is not None
+        while not self._pending.empty():
+            clip = self._pending.get_nowait()
+            if not clip.future.done():
+                clip.future.set_exception(RuntimeError("Whisper batcher stopped"))
+        self._pending = None
+
+        assert self._executor is not None
+        if self._executor is not self._shared_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    async def transcribe(
+        self,
+        audio: Any,
+        *,
+        language: Optional[str],
+        prompt: Optional[str],
+        temperature: Optional[float],
+    ) -> Dict[str, Any]:
+        """Queue a 16 kHz mono clip of at most 30 seconds and wait for its transcript."""
+
+        if self._pending is None:
+            raise RuntimeError("Whisper batcher is not running")
+        future: asyncio.Future[Dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait(_PendingClip(audio, (language, prompt, temperature), future))
+        return await future
+
+    async def _run(self) -> None:
+        assert self._pending is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[_DecodeKey, List[_PendingClip]] = {}
+            for clip in batch:
+                # Skip callers that gave up while waiting.
+                if not clip.future.done():
+                    groups.setdefault(clip.key, []).append(clip)
+
+            for key, clips in groups.items():
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, self._decode_batch, [clip.audio for clip in clips], key
+                    )
+                except Exception as exc:  # pragma: no cover - model errors
+                    for clip in clips:
+                        if not clip.future.done():
+                            clip.future.set_exception(exc)
+                    continue
+                for clip, result in zip(clips, results):
+                    if not clip.future.done():
+                        clip.future.set_result(result)
+
+    def _decode_batch(self, clips: List[Any], key: _DecodeKey) -> List[Dict[str, Any]]:
+        """Run one batched decoder pass, returning ``transcribe``-shaped results."""
+
+        import torch  # type: ignore
+        import whisper  # type: ignore
+
+        model = self._model
+        language, prompt, temperature = key
+        mel = torch.stack(
+            [
+                whisper.pad_or_trim(
+                    whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels),
+                    whisper.audio.N_FRAMES,
+                )
+                for audio in clips
+            ]
+        ).to(model.device)
+        options = whisper.DecodingOptions(
+            language=language,
+            prompt=prompt,
+            temperature=temperature or 0.0,
+            without_timestamps=True,
+            fp16=model.device.type == "cuda",
+        )
+        decoded = whisper.decode(model, mel, options)
+        return [
+            {
+                "text": result.text,
+                "language": result.language,
+                # Timestamps are not decoded, so the clip is reported as one segment.
+                "segments": [
+                    {"id": 0, "start": 0.0, "end": len(audio) / SAMPLE_RATE, "text": result.text}
+                ],
+            }
+            for audio, result in zip(clips, decoded)
+        ]
@@ -0,0 +1,25 @@
+"""Base64 helpers for audio payloads.
+
+Audio runs to megabytes, so the SIMD codec from ``pybase64`` is used when it is
+installed: roughly 8x faster than the stdlib on decode and over 10x on encode.
+"""
+
+from __future__ import annotations
+
+import binascii
+
+try:  # pragma: no cover - optional dependency
+    import pybase64
+except ImportError:  # pragma: no cover - falls back to the stdlib codec
+    pybase64 = None  # type: ignore[assignment]
+
+if pybase64 is not None:
+    b64decode = pybase64.b64decode
+    b64encode_str = pybase64.b64encode_as_string
+else:  # pragma: no cover - exercised only without pybase64
+    b64decode = binascii.a2b_base64
+
+    def b64encode_str(data: bytes) -> str:
+        """Return the base64 encoding of ``data`` as an ASCII string."""
+
+        return binascii.b2a_base64(data, newline=False).decode("ascii")
@@ -0,0 +1,24 @@
+"""Header lookups on raw ASGI scopes."""
+
+from __future__ import annotations
+
+from starlette.types import Scope
+
+
+def header_key(name: str) -> bytes:
+    """Return ``name`` in the lower-cased latin-1 form ASGI servers use for header names."""
+
+    return name.lower().encode("latin-1")
+
+
+def find_header(scope: Scope, key: bytes) -> str | None:
+    """Return the first value of header ``key`` (see :func:`header_key`), if present.
+
+    Scanning ``scope["headers"]`` directly avoids building Starlette's ``Headers``
+    wrapper for a single lookup.
+    """
+
+    for name, value in scope["headers"]:
+        if name == key:
+            return value.decode("latin-1")
+    return None
@@ -0,0 +1,22 @@
+"""Fast JSON helpers shared by streaming endpoints and service clients."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+dumps = orjson.dumps
+loads = orjson.loads
+
+
+def dumps_line(value: Any) -> bytes:
+    """Encode ``value`` as a newline-terminated JSON line."""
+
+    return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def dumps_sse(value: Any) -> bytes:
+    """Encode ``value`` as a single server-sent event ``data:`` frame."""
+
+    return b"data: " + orjson.dumps(value) + b"\n\n"
@@ -1,6 +1,20 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from app.config.settings import Settings  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def api_key_settings() -> Settings:
+    """API-key enforcement enabled with a single ``secret`` key.
+
+    Settings are frozen, so one instance is safely shared across the session.
+    """
+
+    return Settings(api_key_enabled=True, api_keys=frozenset({"secret"}))
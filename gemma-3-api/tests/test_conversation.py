@@ -3,18 +3,32 @@ from typing import AsyncIterator
 
 import pytest
 
+from app.schemas.generation import GenerationRequest
 from app.services.conversation import ConversationService, DialogueResult, DialogueStreamResult
 from app.services.openaudio import OpenAudioSynthesisResult, OpenAudioSynthesisStream
 from app.services.whisper import WhisperTranscription, WhisperTranscriptionSegment
 
 
-class FakeLLMService:
+class FakeSequence:
+    def __init__(self, response_text: str) -> None:
+        self._response_text = response_text
+        self.cancelled = False
+
+    async def text(self) -> str:
+        return self._response_text
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class FakeLLMScheduler:
     def __init__(self, response_text: str = "Hello from Gemma") -> None:
         self._response_text = response_text
-        self.model = self
+        self.submitted: list[dict[str, object]] = []
 
-    def __call__(self, **_: object) -> dict[str, object]:
-        return {"choices": [{"text": self._response_text}]}
+    def submit(self, generation_params: dict[str, object]) -> FakeSequence:
+        self.submitted.append(generation_params)
+        return FakeSequence(self._response_text)
 
 
 class FakeWhisperService:
@@ -61,7 +75,7 @@ class FakeOpenAudioService:
 @pytest.mark.asyncio
 async def test_run_dialogue_returns_compound_result() -> None:
     service = ConversationService(
-        llm_service=FakeLLMService(),
+        llm_scheduler=FakeLLMScheduler(),
         whisper_service=FakeWhisperService(),
         openaudio_service=FakeOpenAudioService(),
     )
@@ -84,7 +98,7 @@ async def test_run_dialogue_returns_compound_result() -> None:
 @pytest.mark.asyncio
 async def test_run_dialogue_streaming_returns_stream_container() -> None:
     service = ConversationService(
-        llm_service=FakeLLMService(),
+        llm_scheduler=FakeLLMScheduler(),
         whisper_service=FakeWhisperService(),
         openaudio_service=FakeOpenAudioService(),
     )
@@ -102,6 +116,31 @@ async def test_run_dialogue_streaming_returns_stream_container() -> None:
     assert chunks == [b"chunk-1", b"chunk-2"]
 
 
+@pytest.mark.asyncio
+async def test_run_dialogue_forwards_only_supplied_generation_overrides() -> None:
+    scheduler = FakeLLMScheduler()
+    service = ConversationService(
+        llm_scheduler=scheduler,
+        whisper_service=FakeWhisperService(),
+        openaudio_service=FakeOpenAudioService(),
+    )
+
+    for overrides in (None, {"temperature": 0.2, "top_k": None}):
+        await service.run_dialogue(
+            audio_bytes=b"bytes",
+            filename="sample.wav",
+            content_type="audio/wav",
+            instructions=None,
+            generation_overrides=overrides,
+        )
+
+    prompt = "User: transcribed text\nAssistant:"
+    assert scheduler.submitted == [
+        {"prompt": prompt},
+        {"prompt": prompt, "temperature": 0.2},
+    ]
+
+
 def test_generation_request_validation_handles_invalid_overrides() -> None:
     with pytest.raises(ValueError):
         ConversationService._build_generation_request(
@@ -110,6 +149,16 @@ def test_generation_request_validation_handles_invalid_overrides() -> None:
         )
 
 
+def test_generation_request_without_overrides_matches_validated_defaults() -> None:
+    request = ConversationService._build_generation_request(
+        prompt="Hello",
+        overrides={"max_tokens": None, "prompt": "ignored"},
+    )
+
+    assert request == GenerationRequest(prompt="Hello")
+    assert request.to_llama_kwargs() == {"prompt": "Hello"}
+
+
 def test_prepare_synthesis_kwargs_filters_reserved_fields() -> None:
     overrides = {
         "text": "ignored",
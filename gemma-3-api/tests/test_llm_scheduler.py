@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from typing import Iterator
+
+import pytest
+
+from app.services.llm_scheduler import LLMScheduler, SequenceHandle
+
+
+class FakeLLMService:
+    def __init__(self) -> None:
+        self.inference_lock = threading.Lock()
+        self.model = self
+        self.prompts: list[str] = []
+
+    def __call__(self, *, prompt: str, stream: bool = False, **_: object) -> Iterator[dict[str, object]]:
+        self.prompts.append(prompt)
+        for token in (f"{prompt}-a", f"{prompt}-b", f"{prompt}-c"):
+            yield {"choices": [{"text": token}]}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_streams_tokens_in_submission_order() -> None:
+    llm_service = FakeLLMService()
+    scheduler = LLMScheduler(llm_service)  # type: ignore[arg-type]
+    await scheduler.startup()
+    try:
+        first = scheduler.submit({"prompt": "one"})
+        second = scheduler.submit({"prompt": "two"})
+
+        assert await first.text() == "one-aone-bone-c"
+        assert [token async for token in second] == ["two-a", "two-b", "two-c"]
+        assert llm_service.prompts == ["one", "two"]
+    finally:
+        await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_batches_tokens() -> None:
+    scheduler = LLMScheduler(FakeLLMService())  # type: ignore[arg-type]
+    await scheduler.startup()
+    try:
+        sequence = scheduler.submit({"prompt": "p"})
+        batches = [batch async for batch in sequence.batches(max_tokens=2, max_delay=1.0)]
+    finally:
+        await scheduler.shutdown()
+
+    assert batches == [["p-a", "p-b"], ["p-c"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_flush_partial_batch_when_delay_elapses() -> None:
+    loop = asyncio.get_running_loop()
+    sequence = SequenceHandle({}, loop)
+
+    async def produce() -> None:
+        sequence.emit("a")
+        sequence.emit("b")
+        await asyncio.sleep(0.05)
+        sequence.emit("c")
+        sequence.finish()
+
+    producer = asyncio.create_task(produce())
+    batches = [batch async for batch in sequence.batches(max_tokens=8, max_delay=0.01)]
+    await producer
+
+    assert batches == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_submit_requires_running_scheduler() -> None:
+    scheduler = LLMScheduler(FakeLLMService())  # type: ignore[arg-type]
+
+    with pytest.raises(RuntimeError):
+        scheduler.submit({"prompt": "p"})
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+from huggingface_hub.utils import LocalEntryNotFoundError
+
+from app.config.settings import Settings
+from app.services import llm as llm_module
+from app.services.llm import LLMService
+
+
+def test_resolve_model_path_prefers_local_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict[str, object]] = []
+
+    def fake_download(**kwargs: object) -> str:
+        calls.append(kwargs)
+        return "/cache/model.gguf"
+
+    monkeypatch.setattr(llm_module, "hf_hub_download", fake_download)
+
+    assert LLMService(Settings())._resolve_model_path() == "/cache/model.gguf"
+    assert len(calls) == 1
+    assert calls[0]["local_files_only"] is True
+
+
+def test_resolve_model_path_downloads_when_not_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict[str, object]] = []
+
+    def fake_download(**kwargs: object) -> str:
+        calls.append(kwargs)
+        if kwargs.get("local_files_only"):
+            raise LocalEntryNotFoundError("not cached")
+        return "/downloaded/model.gguf"
+
+    monkeypatch.setattr(llm_module, "hf_hub_download", fake_download)
+
+    service = LLMService(Settings(hugging_face_hub_token="hf_token"))
+
+    assert service._resolve_model_path() == "/downloaded/model.gguf"
+    assert len(calls) == 2
+    assert calls[1]["token"] == "hf_token"
+
+
+def test_import_llama_cpp_pins_openmp_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+
+    llm_module._import_llama_cpp(3)
+
+    assert os.environ["OMP_NUM_THREADS"] == "3"
+
+
+def test_import_llama_cpp_keeps_explicit_openmp_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OMP_NUM_THREADS", "1")
+
+    llm_module._import_llama_cpp(3)
+
+    assert os.environ["OMP_NUM_THREADS"] == "1"
+
+
+def test_load_config_maps_settings_to_llama_kwargs() -> None:
+    config = llm_module.LlamaLoadConfig.from_settings(Settings(llm_n_threads=6, llm_use_mlock=True))
+
+    kwargs = config.to_kwargs("/models/gemma.gguf")
+
+    assert kwargs["model_path"] == "/models/gemma.gguf"
+    assert kwargs["n_threads"] == kwargs["n_threads_batch"] == 6
+    assert kwargs["use_mmap"] is True
+    assert kwargs["use_mlock"] is True
+    assert kwargs["verbose"] is False
+    assert "lora_path" not in kwargs
+
+
+def test_tokenize_batch_does_not_wait_for_generation() -> None:
+    class _FakeLlama:
+        def tokenize(self, text: bytes, add_bos: bool = True) -> list[int]:
+            return ([1] if add_bos else []) + list(text)
+
+    service = LLMService(Settings())
+    service._llm = _FakeLlama()  # type: ignore[assignment]
+
+    # A generation holds the lock for its whole run; tokenization must not queue behind it.
+    with service.inference_lock:
+        assert service.tokenize_batch(["hi", "a"]) == [[1, 104, 105], [1, 97]]
+        assert service.tokenize_batch(["a"], add_bos=False) == [[97]]
@@ -0,0 +1,92 @@
+import gzip
+import threading
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.observability import metrics
+from app.observability.metrics import MetricsSnapshot, record_external_call, record_http_request
+
+
+def _requests_total(method: str, route: str, status_class: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "app_http_requests_total",
+        {"method": method, "route": route, "status_class": status_class},
+    )
+    return value or 0.0
+
+
+def test_record_http_request_buckets_status_codes_by_class() -> None:
+    route = "/test/status-class"
+
+    record_http_request("GET", route, 404, 0.01)
+    record_http_request("GET", route, 429, 0.01)
+    record_http_request("GET", route, 503, 0.01)
+
+    assert _requests_total("GET", route, "4xx") == 2
+    assert _requests_total("GET", route, "5xx") == 1
+    errors = REGISTRY.get_sample_value(
+        "app_http_request_errors_total",
+        {"method": "GET", "route": route, "status_class": "5xx"},
+    )
+    assert errors == 1
+
+
+def test_record_http_request_reuses_bound_label_children() -> None:
+    route = "/test/cached-children"
+
+    record_http_request("POST", route, 200, 0.01)
+    series = metrics._route_series[("POST", route)]
+    record_http_request("POST", route, 201, 0.02)
+
+    assert metrics._route_series[("POST", route)] is series
+    assert _requests_total("POST", route, "2xx") == 2
+
+
+def test_record_external_call_counts_failures_on_cached_children() -> None:
+    record_external_call("test_service", 0.5, success=True)
+    record_external_call("test_service", 0.25, success=False)
+
+    labels = {"service": "test_service"}
+    assert REGISTRY.get_sample_value("app_external_call_duration_seconds_count", labels) == 2
+    assert REGISTRY.get_sample_value("app_external_call_errors_total", labels) == 1
+    assert "test_service" in metrics._external_call_children
+
+
+@pytest.mark.asyncio
+async def test_metrics_snapshot_compresses_lazily_and_reuses_payload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    renders: list[int] = []
+
+    def fake_generate_latest() -> bytes:
+        renders.append(1)
+        return b"app_metric 1.0\n"
+
+    monkeypatch.setattr(metrics, "generate_latest", fake_generate_latest)
+    snapshot = MetricsSnapshot(ttl_seconds=60)
+
+    plain = await snapshot.get(gzipped=False)
+    assert snapshot._gzipped is None
+
+    compressed = await snapshot.get(gzipped=True)
+
+    assert plain == b"app_metric 1.0\n"
+    assert gzip.decompress(compressed) == plain
+    assert await snapshot.get(gzipped=True) is compressed
+    assert len(renders) == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_snapshot_renders_off_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    render_threads: list[int] = []
+
+    def fake_generate_latest() -> bytes:
+        render_threads.append(threading.get_ident())
+        return b""
+
+    monkeypatch.setattr(metrics, "generate_latest", fake_generate_latest)
+
+    await MetricsSnapshot().get(gzipped=False)
+
+    assert render_threads and render_threads[0] != threading.get_ident()
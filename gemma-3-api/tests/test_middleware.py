@@ -0,0 +1,101 @@
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from app.config.settings import Settings
+from app.observability.logging import _REQUEST_ID
+from app.observability import middleware as middleware_module
+from app.observability.middleware import RequestContextMiddleware
+
+
+def _http_scope(headers: list[tuple[bytes, bytes]]) -> Scope:
+    return {"type": "http", "method": "GET", "path": "/items", "headers": headers}
+
+
+async def _receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _run(middleware: RequestContextMiddleware, scope: Scope) -> list[Message]:
+    sent: list[Message] = []
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    await middleware(scope, _receive, send)
+    return sent
+
+
+async def _ok_app(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 204, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+@pytest.mark.asyncio
+async def test_middleware_propagates_incoming_request_id() -> None:
+    seen: list[str] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(_REQUEST_ID.get())
+        await _ok_app(scope, receive, send)
+
+    middleware = RequestContextMiddleware(app, settings=Settings())
+    sent = await _run(middleware, _http_scope([(b"x-request-id", b"abc123")]))
+
+    assert seen == ["abc123"]
+    assert (b"x-request-id", b"abc123") in sent[0]["headers"]
+    assert sent[0]["status"] == 204
+
+
+@pytest.mark.asyncio
+async def test_middleware_generates_request_id_when_missing() -> None:
+    middleware = RequestContextMiddleware(_ok_app, settings=Settings())
+    scope = _http_scope([])
+
+    sent = await _run(middleware, scope)
+
+    headers = dict(sent[0]["headers"])
+    assert len(headers[b"x-request-id"]) == 32
+    assert scope["state"]["request_id"] == headers[b"x-request-id"].decode()
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_through_non_http_scopes() -> None:
+    calls: list[str] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        calls.append(scope["type"])
+
+    middleware = RequestContextMiddleware(app, settings=Settings())
+    await middleware({"type": "lifespan"}, _receive, _ok_app)  # type: ignore[arg-type]
+
+    assert calls == ["lifespan"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_skips_excluded_paths() -> None:
+    middleware = RequestContextMiddleware(_ok_app, settings=Settings())
+    scope: Scope = {"type": "http", "method": "GET", "path": "/metrics", "headers": []}
+
+    sent = await _run(middleware, scope)
+
+    assert sent[0]["headers"] == []
+    assert "state" not in scope
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_unmatched_requests_without_raw_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: list[tuple[str, str, int]] = []
+
+    def fake_record(method: str, route: str, status_code: int, duration: float) -> None:
+        recorded.append((method, route, status_code))
+
+    monkeypatch.setattr(middleware_module, "record_http_request", fake_record)
+    middleware = RequestContextMiddleware(_ok_app, settings=Settings())
+    scope = _http_scope([])
+    scope["method"] = "PROPFIND"
+
+    await _run(middleware, scope)
+
+    assert recorded == [("OTHER", "unmatched", 204)]
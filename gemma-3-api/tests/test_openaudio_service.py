@@ -1,18 +1,17 @@
 from typing import Any, AsyncIterator, Dict, List
 
-import pytest
-
-from typing import Any, AsyncIterator, Dict, List
-
+import orjson
 import pytest
 
 from app.config.settings import Settings
+from app.services import openaudio as openaudio_module
 from app.services.openaudio import OpenAudioService
 
 
 class _DummyStreamResponse:
-    def __init__(self, chunks: List[bytes]) -> None:
+    def __init__(self, chunks: List[bytes], headers: Dict[str, str] | None = None) -> None:
         self._chunks = chunks
+        self.headers = headers or {}
 
     async def __aenter__(self) -> "_DummyStreamResponse":
         return self
@@ -20,7 +19,15 @@ class _DummyStreamResponse:
     async def __aexit__(self, exc_type, exc, tb) -> None:  # pragma: no cover - no cleanup required
         return None
 
-    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+    async def aiter_bytes(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        self.chunk_size = chunk_size
+        self.decoded = True
+        for chunk in self._chunks:
+            yield chunk
+
+    async def aiter_raw(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        self.chunk_size = chunk_size
+        self.decoded = False
         for chunk in self._chunks:
             yield chunk
 
@@ -29,12 +36,15 @@ class _DummyStreamResponse:
 
 
 class _FakeAsyncClient:
-    def __init__(self) -> None:
+    def __init__(self, response: _DummyStreamResponse | None = None) -> None:
         self.calls: List[Dict[str, Any]] = []
+        self._response = response
 
-    def stream(self, method: str, path: str, *, json: Dict[str, Any], headers: Dict[str, str]):
-        self.calls.append({"method": method, "path": path, "json": json, "headers": headers})
-        return _DummyStreamResponse(chunks=[b"chunk-1", b"chunk-2"])
+    def stream(self, method: str, path: str, *, content: bytes, headers: Dict[str, str]):
+        self.calls.append(
+            {"method": method, "path": path, "json": orjson.loads(content), "headers": headers}
+        )
+        return self._response or _DummyStreamResponse(chunks=[b"chunk-1", b"chunk-2"])
 
 
 @pytest.mark.asyncio
@@ -61,3 +71,200 @@ async def test_synthesize_stream_sets_stream_flag() -> None:
     request_payload = fake_client.calls[0]["json"]
     assert request_payload.get("streaming") is True
 
+
+@pytest.mark.asyncio
+async def test_synthesize_requests_raw_audio() -> None:
+    service = OpenAudioService(settings=Settings(openaudio_default_format="wav"))
+    response = _DummyStreamResponse(
+        [b"RIFF-", b"audio"],
+        {"content-type": "audio/wav", "content-length": "10", "x-sample-rate": "22050"},
+    )
+    fake_client = _FakeAsyncClient(response)
+    service._client = fake_client  # type: ignore[attr-defined]
+
+    result = await service.synthesize(text="hello world")
+
+    assert result.audio == b"RIFF-audio"
+    assert result.sample_rate == 22050
+    assert result.media_type == "audio/wav"
+    assert fake_client.calls[0]["headers"]["Accept"] == "audio/wav, application/json;q=0.5"
+    assert fake_client.calls[0]["headers"]["Content-Type"] == "application/json"
+    assert fake_client.calls[0]["headers"]["Accept-Encoding"] == "identity"
+    assert fake_client.calls[0]["json"]["text"] == "hello world"
+
+
+@pytest.mark.asyncio
+async def test_synthesize_grows_buffer_past_preallocation_cap(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(openaudio_module, "_PREALLOCATE_MAX_BYTES", 4)
+    service = OpenAudioService(settings=Settings())
+    response = _DummyStreamResponse(
+        [b"RIFF-", b"audio"], {"content-type": "audio/wav", "content-length": "10"}
+    )
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    result = await service.synthesize(text="hello world")
+
+    assert result.audio == b"RIFF-audio"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("declared", ["9", "11", str(1 << 40)])
+async def test_synthesize_rejects_body_not_matching_content_length(declared: str) -> None:
+    service = OpenAudioService(settings=Settings())
+    response = _DummyStreamResponse(
+        [b"RIFF-", b"audio"], {"content-type": "audio/wav", "content-length": declared}
+    )
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    with pytest.raises(RuntimeError):
+        await service.synthesize(text="hello world")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("thread_threshold", [1 << 20, 0])
+async def test_synthesize_decodes_json_envelope(
+    monkeypatch: pytest.MonkeyPatch, thread_threshold: int
+) -> None:
+    monkeypatch.setattr(openaudio_module, "_THREAD_DECODE_MIN_BYTES", thread_threshold)
+    service = OpenAudioService(settings=Settings())
+    response = _DummyStreamResponse(
+        [b'{"audio": "aGVsbG8=", "format": "mp3",', b' "sample_rate": 44100}'],
+        {"content-type": "application/json"},
+    )
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    result = await service.synthesize(text="hello world")
+
+    assert result.audio == b"hello"
+    assert result.response_format == "mp3"
+    assert result.sample_rate == 44100
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_applies_configured_chunk_size() -> None:
+    service = OpenAudioService(settings=Settings(openaudio_stream_chunk_bytes=640))
+    response = _DummyStreamResponse([b"pcm"])
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    stream = await service.synthesize_stream(text="hello world")
+    chunks = [chunk async for chunk in stream.iterator_factory()]
+
+    assert chunks == [b"pcm"]
+    assert response.chunk_size == 640
+    assert response.decoded is False
+
+
+def test_build_payload_layers_overrides_on_settings_defaults() -> None:
+    settings = Settings(
+        openaudio_default_format="mp3",
+        openaudio_default_reference_id="narrator",
+        openaudio_default_normalize=False,
+    )
+    service = OpenAudioService(settings=settings)
+
+    defaults = service._build_payload(
+        text="hi",
+        response_format=None,
+        sample_rate=None,
+        reference_id=None,
+        normalize=None,
+        references=None,
+        top_p=None,
+    )
+    overridden = service._build_payload(
+        text="hi",
+        response_format="wav",
+        sample_rate=24000,
+        reference_id="guide",
+        normalize=True,
+        references=("ref",),
+        top_p=0.5,
+    )
+
+    assert defaults == {
+        "text": "hi",
+        "format": "mp3",
+        "streaming": False,
+        "reference_id": "narrator",
+        "normalize": False,
+    }
+    assert overridden == {
+        "text": "hi",
+        "format": "wav",
+        "streaming": False,
+        "reference_id": "guide",
+        "sample_rate": 24000,
+        "normalize": True,
+        "references": ["ref"],
+        "top_p": 0.5,
+    }
+    assert service._base_payload["format"] == "mp3"
+
+
+@pytest.mark.asyncio
+async def test_require_client_skips_lock_once_initialised() -> None:
+    service = OpenAudioService(settings=Settings())
+    fake_client = _FakeAsyncClient()
+    service._client = fake_client  # type: ignore[attr-defined]
+
+    async with service._client_lock:
+        assert await service._require_client() is fake_client
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_decodes_encoded_responses() -> None:
+    service = OpenAudioService(settings=Settings())
+    response = _DummyStreamResponse([b"audio"], {"content-encoding": "gzip"})
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    stream = await service.synthesize_stream(text="hello world")
+    collected = [chunk async for chunk in stream.iterator_factory()]
+
+    assert collected == [b"audio"]
+    assert response.decoded is True
+
+
+@pytest.mark.asyncio
+async def test_synthesize_falls_back_on_malformed_sample_rate_header() -> None:
+    service = OpenAudioService(settings=Settings(default_audio_sample_rate=16000))
+    response = _DummyStreamResponse([b"pcm"], {"content-type": "audio/wav", "x-sample-rate": "fast"})
+    service._client = _FakeAsyncClient(response)  # type: ignore[attr-defined]
+
+    result = await service.synthesize(text="hello world")
+
+    assert result.sample_rate == 16000
+
+
+@pytest.mark.asyncio
+async def test_synthesize_reuses_cached_results_for_identical_requests() -> None:
+    service = OpenAudioService(settings=Settings(openaudio_result_cache_bytes=1024))
+    fake_client = _FakeAsyncClient()
+    service._client = fake_client  # type: ignore[attr-defined]
+
+    first = await service.synthesize(text="welcome back")
+    second = await service.synthesize(text="welcome back")
+    other = await service.synthesize(text="welcome back", response_format="mp3")
+
+    assert second is first
+    assert type(first.audio) is bytes
+    assert other is not first
+    assert len(fake_client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_synthesize_cache_evicts_least_recently_used() -> None:
+    service = OpenAudioService(settings=Settings(openaudio_result_cache_bytes=40))
+    fake_client = _FakeAsyncClient()
+    service._client = fake_client  # type: ignore[attr-defined]
+
+    # Each fake response is 14 bytes, so the cache holds two of them.
+    await service.synthesize(text="one")
+    await service.synthesize(text="two")
+    await service.synthesize(text="one")
+    await service.synthesize(text="three")
+    await service.synthesize(text="one")
+    await service.synthesize(text="two")
+
+    assert [call["json"]["text"] for call in fake_client.calls] == ["one", "two", "three", "two"]
@@ -5,6 +5,7 @@ from fastapi import HTTPException, Request
 from starlette.datastructures import Headers
 
 from app.config.settings import Settings
+from app.security import rate_limiter as rate_limiter_module
 from app.security.rate_limiter import (
     RateLimiter,
     enforce_rate_limit,
@@ -35,7 +36,7 @@ def _build_request(
 
 class DummyWebSocket:
     def __init__(self, headers: dict[str, str], limiter: RateLimiter, host: str = "127.0.0.1") -> None:
-        self.headers = Headers(headers)
+        self.scope = {"type": "websocket", "headers": Headers(headers).raw}
         self.client = SimpleNamespace(host=host, port=1234)
         self.app = SimpleNamespace(state=SimpleNamespace(rate_limiter=limiter))
         self.closed = False
@@ -96,3 +97,38 @@ async def test_websocket_rate_limiter_closes_on_rejection() -> None:
     assert allowed_second is False
     assert websocket.closed is True
     assert websocket.close_args[-1][0] == 4429
+
+
+@pytest.mark.asyncio
+async def test_websocket_rate_limiter_isolated_per_api_key() -> None:
+    settings = Settings(rate_limit_enabled=True, rate_limit_requests=1, rate_limit_window_seconds=60)
+    limiter = RateLimiter(settings=settings)
+
+    def connect(key: str) -> DummyWebSocket:
+        return DummyWebSocket({"X-API-Key": key}, limiter)
+
+    assert limiter.identifier_from_websocket(connect("alpha")) == ("alpha", "api_key")
+    assert await enforce_websocket_rate_limit(connect("alpha"), limiter=limiter)
+    # A different key gets its own bucket even from the same host.
+    assert await enforce_websocket_rate_limit(connect("beta"), limiter=limiter)
+    assert not await enforce_websocket_rate_limit(connect("alpha"), limiter=limiter)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_evicts_idle_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(rate_limit_enabled=True, rate_limit_requests=1, rate_limit_window_seconds=10)
+    limiter = RateLimiter(settings=settings)
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: clock.now)
+
+    await limiter.acquire("alpha", "ip")
+    limiter.try_acquire("beta", "ip")
+    clock.now += 30
+    # Renewing "beta" pushes its deadline out past the next sweep.
+    await limiter.acquire("beta", "ip")
+
+    clock.now += 25
+    await limiter.acquire("gamma", "ip")
+
+    assert set(limiter._buckets) == {"ip:beta", "ip:gamma"}
+    assert len(limiter._expiry) == 2
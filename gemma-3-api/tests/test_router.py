@@ -0,0 +1,25 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.router import build_api_router
+from app.config.settings import Settings, get_settings
+
+
+def _client(settings: Settings) -> TestClient:
+    app = FastAPI()
+    app.include_router(build_api_router(settings))
+    app.dependency_overrides[get_settings] = lambda: settings
+    return TestClient(app)
+
+
+def test_api_router_omits_disabled_api_key_guard() -> None:
+    response = _client(Settings()).get("/v1/models")
+
+    assert response.status_code == 200
+
+
+def test_api_router_enforces_enabled_api_key_guard() -> None:
+    client = _client(Settings(api_key_enabled=True, api_keys=frozenset({"secret"})))
+
+    assert client.get("/v1/models").status_code == 401
+    assert client.get("/v1/models", headers={"X-API-Key": "secret"}).status_code == 200
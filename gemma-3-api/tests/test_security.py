@@ -8,8 +8,9 @@ from app.security.api_key import enforce_websocket_api_key, require_api_key
 
 
 class DummyWebSocket:
-    def __init__(self, headers: Headers) -> None:
-        self.headers = headers
+    def __init__(self, headers: dict[str, str]) -> None:
+        # Only the raw ASGI scope is exposed, as the guards never build ``Headers``.
+        self.scope = {"type": "websocket", "headers": Headers(headers).raw}
         self.closed = False
         self.close_args: list[tuple[int, str]] = []
 
@@ -36,24 +37,41 @@ def test_require_api_key_noop_when_disabled() -> None:
     require_api_key(request, settings=settings)  # Should not raise
 
 
-def test_require_api_key_rejects_missing_header() -> None:
+def test_require_api_key_rejects_missing_header(api_key_settings: Settings) -> None:
     request = _build_request({})
-    settings = Settings(api_key_enabled=True, api_keys=["secret"])
+    settings = api_key_settings
     with pytest.raises(HTTPException) as exc:
         require_api_key(request, settings=settings)
     assert exc.value.status_code == 401
 
 
-def test_require_api_key_accepts_valid_header() -> None:
+def test_require_api_key_accepts_valid_header(api_key_settings: Settings) -> None:
     request = _build_request({"X-API-Key": "secret"})
-    settings = Settings(api_key_enabled=True, api_keys=["secret"])
+    settings = api_key_settings
     require_api_key(request, settings=settings)
 
 
+def test_require_api_key_accepts_keys_configured_as_list() -> None:
+    settings = Settings(api_key_enabled=True, api_keys=["secret"])  # type: ignore[arg-type]
+
+    require_api_key(_build_request({"X-API-Key": "secret"}), settings=settings)
+    with pytest.raises(HTTPException) as exc:
+        require_api_key(_build_request({"X-API-Key": "other"}), settings=settings)
+    assert exc.value.status_code == 403
+
+
+def test_require_api_key_rejects_invalid_header(api_key_settings: Settings) -> None:
+    request = _build_request({"X-API-Key": "secreT"})
+    settings = api_key_settings
+    with pytest.raises(HTTPException) as exc:
+        require_api_key(request, settings=settings)
+    assert exc.value.status_code == 403
+
+
 @pytest.mark.asyncio
-async def test_websocket_enforcement_closes_on_missing_key() -> None:
-    websocket = DummyWebSocket(Headers({}))
-    settings = Settings(api_key_enabled=True, api_keys=["secret"])
+async def test_websocket_enforcement_closes_on_missing_key(api_key_settings: Settings) -> None:
+    websocket = DummyWebSocket({})
+    settings = api_key_settings
 
     authorised = await enforce_websocket_api_key(websocket, settings=settings)
 
@@ -63,11 +81,33 @@ async def test_websocket_enforcement_closes_on_missing_key() -> None:
 
 
 @pytest.mark.asyncio
-async def test_websocket_enforcement_allows_valid_key() -> None:
-    websocket = DummyWebSocket(Headers({"X-API-Key": "secret"}))
-    settings = Settings(api_key_enabled=True, api_keys=["secret"])
+async def test_websocket_enforcement_allows_valid_key(api_key_settings: Settings) -> None:
+    websocket = DummyWebSocket({"X-API-Key": "secret"})
+    settings = api_key_settings
 
     authorised = await enforce_websocket_api_key(websocket, settings=settings)
 
     assert authorised is True
     assert websocket.closed is False
+
+
+@pytest.mark.asyncio
+async def test_websocket_enforcement_rejects_invalid_key(api_key_settings: Settings) -> None:
+    websocket = DummyWebSocket({"x-api-key": "secreT"})
+
+    authorised = await enforce_websocket_api_key(websocket, settings=api_key_settings)
+
+    assert authorised is False
+    assert websocket.close_args[0][0] == 4403
+
+
+@pytest.mark.asyncio
+async def test_websocket_enforcement_reads_custom_header_from_scope() -> None:
+    settings = Settings(
+        api_key_enabled=True, api_key_header_name="X-Token", api_keys=frozenset({"secret"})
+    )
+
+    assert await enforce_websocket_api_key(DummyWebSocket({"X-Token": "secret"}), settings=settings)
+    assert not await enforce_websocket_api_key(
+        DummyWebSocket({"X-API-Key": "secret"}), settings=settings
+    )
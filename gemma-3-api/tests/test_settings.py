@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import msgspec
+import pytest
+
+from app.config.settings import Settings, get_settings, reset_for_tests
+
+
+def test_from_env_coerces_strings_and_splits_api_keys() -> None:
+    settings = Settings.from_env(
+        {"API_KEYS": "alpha, beta,", "RATE_LIMIT_ENABLED": "true", "llm_n_threads": "4"},
+        env_file=None,
+    )
+
+    assert settings.api_keys == frozenset({"alpha", "beta"})
+    assert settings.rate_limit_enabled is True
+    assert settings.llm_n_threads == 4
+
+
+def test_from_env_splits_observability_exclude_paths() -> None:
+    settings = Settings.from_env({"OBSERVABILITY_EXCLUDE_PATHS": "/metrics,/ready"}, env_file=None)
+
+    assert settings.observability_exclude_paths == frozenset({"/metrics", "/ready"})
+
+
+def test_from_env_prefers_environment_over_dotenv(tmp_path: Path) -> None:
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# comment\nexport LOG_LEVEL=DEBUG\nOPENAUDIO_API_BASE='http://tts:8080'\nAPI_KEY_HEADER_NAME=X-Key # inline\n",
+        encoding="utf-8",
+    )
+
+    settings = Settings.from_env({"LOG_LEVEL": "WARNING"}, env_file=env_file)
+
+    assert settings.log_level == "WARNING"
+    assert settings.openaudio_api_base == "http://tts:8080"
+    assert settings.api_key_header_name == "X-Key"
+
+
+def test_from_env_rejects_invalid_values() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        Settings.from_env({"RATE_LIMIT_REQUESTS": "0"}, env_file=None)
+
+
+def test_settings_are_immutable_and_hashable() -> None:
+    settings = Settings(api_keys=frozenset({"secret"}))
+
+    with pytest.raises(AttributeError):
+        settings.api_key_enabled = True  # type: ignore[misc]
+    assert hash(settings) == hash(Settings(api_keys=frozenset({"secret"})))
+
+
+def test_get_settings_is_cached_until_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    reset_for_tests()
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    first = get_settings()
+    monkeypatch.setenv("LOG_LEVEL", "ERROR")
+
+    assert get_settings() is first
+    reset_for_tests()
+    assert get_settings().log_level == "ERROR"
+    reset_for_tests()
+
+
+def test_from_env_rejects_unknown_whisper_backend() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        Settings.from_env({"LOCAL_WHISPER_BACKEND": "whisper.cpp"}, env_file=None)
+
+
+def test_validate_checks_and_coerces_fields() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        Settings.validate({"rate_limit_requests": 0})
+    with pytest.raises(msgspec.ValidationError):
+        Settings.validate({"local_whisper_backend": "whisper.cpp"})
+
+    settings = Settings.validate({"api_keys": ["alpha", "beta"]})
+
+    assert settings.api_keys == frozenset({"alpha", "beta"})
+    assert hash(settings) == hash(Settings(api_keys=frozenset({"alpha", "beta"})))
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("1", True),
+        ("True", True),
+        ("yes", True),
+        ("ON", True),
+        ("t", True),
+        ("y", True),
+        ("0", False),
+        ("false", False),
+        ("No", False),
+        ("off", False),
+        ("F", False),
+        ("n", False),
+    ],
+)
+def test_from_env_accepts_pydantic_boolean_spellings(raw: str, expected: bool) -> None:
+    settings = Settings.from_env({"API_KEY_ENABLED": raw}, env_file=None)
+
+    assert settings.api_key_enabled is expected
+
+
+def test_from_env_rejects_unknown_boolean_spellings() -> None:
+    with pytest.raises(msgspec.ValidationError):
+        Settings.from_env({"API_KEY_ENABLED": "enabled"}, env_file=None)
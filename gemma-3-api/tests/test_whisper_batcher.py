@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from app.services.whisper_batcher import WhisperBatcher
+
+
+class _RecordingBatcher(WhisperBatcher):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(model=None, **kwargs)
+        self.batches: List[List[Any]] = []
+
+    def _decode_batch(self, clips: List[Any], key: Any) -> List[Dict[str, Any]]:
+        self.batches.append(list(clips))
+        language = key[0] or "en"
+        return [{"text": f"clip {clip}", "language": language, "segments": []} for clip in clips]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_clips_share_one_decoder_pass() -> None:
+    batcher = _RecordingBatcher(max_batch_size=8, max_wait=0.005)
+    await batcher.startup()
+    try:
+        results = await asyncio.gather(
+            *(
+                batcher.transcribe(clip, language=None, prompt=None, temperature=None)
+                for clip in ("a", "b", "c")
+            )
+        )
+    finally:
+        await batcher.shutdown()
+
+    assert [result["text"] for result in results] == ["clip a", "clip b", "clip c"]
+    assert batcher.batches == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_clips_with_different_options_are_decoded_separately() -> None:
+    batcher = _RecordingBatcher(max_batch_size=8, max_wait=0.005)
+    await batcher.startup()
+    try:
+        english, indonesian = await asyncio.gather(
+            batcher.transcribe("a", language="en", prompt=None, temperature=None),
+            batcher.transcribe("b", language="id", prompt=None, temperature=None),
+        )
+    finally:
+        await batcher.shutdown()
+
+    assert english["language"] == "en"
+    assert indonesian["language"] == "id"
+    assert batcher.batches == [["a"], ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_batch_size() -> None:
+    batcher = _RecordingBatcher(max_batch_size=2, max_wait=0.005)
+    await batcher.startup()
+    try:
+        await asyncio.gather(
+            *(
+                batcher.transcribe(clip, language=None, prompt=None, temperature=None)
+                for clip in ("a", "b", "c")
+            )
+        )
+    finally:
+        await batcher.shutdown()
+
+    assert batcher.batches == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_transcribe_requires_a_running_batcher() -> None:
+    batcher = _RecordingBatcher(max_batch_size=2, max_wait=0.0)
+
+    with pytest.raises(RuntimeError):
+        await batcher.transcribe("a", language=None, prompt=None, temperature=None)
@@ -0,0 +1,362 @@
+import asyncio
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app.config.settings import Settings
+from app.services.whisper import WhisperService, WhisperTranscription, WhisperTranscriptionSegment
+
+np = pytest.importorskip("numpy")
+soundfile = pytest.importorskip("soundfile")
+
+
+class _FakeLocalModel:
+    def __init__(self) -> None:
+        self.inputs: List[Any] = []
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+        self.inputs.append(audio)
+        return {"text": "hello", "language": "en", "segments": []}
+
+
+def _wav_bytes(sample_rate: int, channels: int = 1, frames: int = 160) -> bytes:
+    buffer = io.BytesIO()
+    soundfile.write(buffer, np.full((frames, channels), 0.25, dtype="float32"), sample_rate, format="WAV")
+    return buffer.getvalue()
+
+
+def _local_service(**overrides: Any) -> tuple[WhisperService, _FakeLocalModel]:
+    service = WhisperService(Settings(enable_local_whisper=True, **overrides))
+    model = _FakeLocalModel()
+    service._local_model = model  # type: ignore[attr-defined]
+    return service, model
+
+
+@pytest.mark.asyncio
+async def test_local_transcription_decodes_16k_audio_in_memory() -> None:
+    service, model = _local_service()
+
+    result = await service.transcribe(_wav_bytes(16000, channels=2), filename="clip.wav")
+
+    assert result.text == "hello"
+    (audio,) = model.inputs
+    assert audio.dtype == np.float32
+    assert audio.shape == (160,)
+
+
+@pytest.mark.asyncio
+async def test_local_transcription_falls_back_to_ffmpeg_for_other_rates() -> None:
+    service, model = _local_service()
+
+    await service.transcribe(_wav_bytes(44100), filename="clip.wav")
+
+    (audio,) = model.inputs
+    assert isinstance(audio, str) and audio.endswith(".wav")
+
+
+@pytest.mark.asyncio
+async def test_remote_services_with_identical_config_share_one_client() -> None:
+    pytest.importorskip("openai")
+    settings = Settings(openai_api_key="sk-test")
+    first, second = WhisperService(settings), WhisperService(settings)
+    other = WhisperService(Settings(openai_api_key="sk-other"))
+
+    await first.startup()
+    await second.startup()
+    await other.startup()
+    try:
+        assert first._client is second._client  # type: ignore[attr-defined]
+        assert other._client is not first._client  # type: ignore[attr-defined]
+        client = first._client  # type: ignore[attr-defined]
+
+        await first.shutdown()
+        assert not client.is_closed()
+        await second.shutdown()
+        assert client.is_closed()
+    finally:
+        await first.shutdown()
+        await second.shutdown()
+        await other.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_repeated_greedy_uploads_are_served_from_cache() -> None:
+    service, model = _local_service(whisper_cache_size=8)
+    clip = _wav_bytes(16000)
+
+    first = await service.transcribe(clip, filename="clip.wav")
+    second = await service.transcribe(io.BytesIO(clip), filename="clip.wav")
+    await service.transcribe(clip, filename="clip.wav", language="id")
+
+    assert second is first
+    assert len(model.inputs) == 2
+
+
+@pytest.mark.asyncio
+async def test_sampled_transcriptions_bypass_the_cache() -> None:
+    service, model = _local_service(whisper_cache_size=8)
+    clip = _wav_bytes(16000)
+
+    await service.transcribe(clip, filename="clip.wav", temperature=0.4)
+    await service.transcribe(clip, filename="clip.wav", temperature=0.4)
+
+    assert len(model.inputs) == 2
+
+
+@pytest.mark.asyncio
+async def test_transcription_cache_is_disabled_by_default() -> None:
+    service, model = _local_service()
+    clip = _wav_bytes(16000)
+
+    await service.transcribe(clip, filename="clip.wav")
+    await service.transcribe(clip, filename="clip.wav")
+
+    assert len(model.inputs) == 2
+
+
+def test_from_dict_fills_defaults_for_partial_segments() -> None:
+    transcription = WhisperTranscription.from_dict(
+        {
+            "text": "hi there",
+            "segments": [
+                {"id": 0, "seek": 0, "start": 0.0, "end": 1.0, "text": "hi"},
+                {"start": 1.0, "text": "there"},
+            ],
+        }
+    )
+
+    assert transcription.segments == [
+        WhisperTranscriptionSegment(id=0, start=0.0, end=1.0, text="hi"),
+        WhisperTranscriptionSegment(id=None, start=1.0, end=None, text="there"),
+    ]
+    assert transcription.language is None
+
+
+class _FakeSegment:
+    def __init__(self, id: int, start: float, end: float, text: str) -> None:
+        self.id, self.start, self.end, self.text = id, start, end, text
+
+
+class _FakeFasterWhisperModel:
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> tuple[Any, Any]:
+        self.calls.append({"audio": audio.read(), **kwargs})
+        segments = (
+            _FakeSegment(i, float(i), float(i + 1), text) for i, text in enumerate([" halo", " dunia"])
+        )
+        return segments, type("Info", (), {"language": "id"})()
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_backend_streams_upload_to_the_model() -> None:
+    service = WhisperService(Settings(enable_local_whisper=True, local_whisper_backend="faster-whisper"))
+    model = _FakeFasterWhisperModel()
+    service._local_model = model  # type: ignore[attr-defined]
+
+    result = await service.transcribe(b"opus-bytes", filename="clip.ogg", prompt="greeting")
+
+    assert result.text == " halo dunia"
+    assert result.language == "id"
+    assert [segment.text for segment in result.segments] == [" halo", " dunia"]
+    assert model.calls == [{"audio": b"opus-bytes", "language": None, "initial_prompt": "greeting"}]
+
+
+def test_faster_whisper_compute_type_defaults_to_int8_without_cuda(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    ctranslate2 = pytest.importorskip("ctranslate2")
+    from app.services import whisper as whisper_module
+
+    monkeypatch.setattr(ctranslate2, "get_cuda_device_count", lambda: 0)
+    assert whisper_module._default_compute_type() == "int8"
+    monkeypatch.setattr(ctranslate2, "get_cuda_device_count", lambda: 1)
+    assert whisper_module._default_compute_type() == "float16"
+
+
+class _FakeTranscriptions:
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    async def create(self, **kwargs: Any) -> Dict[str, Any]:
+        self.calls.append(kwargs)
+        return {"text": "hello", "language": "en", "segments": []}
+
+
+class _FakeOpenAIClient:
+    def __init__(self) -> None:
+        self.audio = type("Audio", (), {})()
+        self.audio.transcriptions = _FakeTranscriptions()
+
+
+@pytest.mark.asyncio
+async def test_remote_requests_layer_overrides_on_settings_defaults() -> None:
+    service = WhisperService(
+        Settings(openai_whisper_model="whisper-1", openai_whisper_response_format="verbose_json")
+    )
+    client = _FakeOpenAIClient()
+    service._client = client  # type: ignore[attr-defined]
+
+    await service.transcribe(b"a", filename="a.wav")
+    await service.transcribe(
+        b"b", filename="b.mp3", content_type="audio/mpeg", response_format="json", language="id"
+    )
+
+    default_call, override_call = client.audio.transcriptions.calls
+    assert default_call == {
+        "model": "whisper-1",
+        "response_format": "verbose_json",
+        "file": ("a.wav", b"a", "application/octet-stream"),
+    }
+    assert override_call == {
+        "model": "whisper-1",
+        "response_format": "json",
+        "file": ("b.mp3", b"b", "audio/mpeg"),
+        "language": "id",
+    }
+    assert service._remote_request_base["response_format"] == "verbose_json"  # type: ignore[attr-defined]
+
+
+class _ConcurrencyProbe:
+    """Records the peak number of threads inside the model at once."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_faster_whisper_inference_is_capped_at_configured_workers() -> None:
+    service = WhisperService(
+        Settings(
+            enable_local_whisper=True,
+            local_whisper_backend="faster-whisper",
+            local_whisper_workers=2,
+        )
+    )
+    probe = _ConcurrencyProbe()
+
+    class _SlowModel:
+        def transcribe(self, audio: Any, **kwargs: Any) -> tuple[Any, Any]:
+            probe.enter()
+            return iter(()), type("Info", (), {"language": "en"})()
+
+    service._local_model = _SlowModel()  # type: ignore[attr-defined]
+
+    await asyncio.gather(*(service.transcribe(bytes([i]), filename="clip.ogg") for i in range(5)))
+
+    assert probe.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_whisper_inference_is_serialised_regardless_of_workers() -> None:
+    service = WhisperService(Settings(enable_local_whisper=True, local_whisper_workers=4))
+    probe = _ConcurrencyProbe()
+
+    class _SlowModel:
+        def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+            probe.enter()
+            return {"text": "", "segments": []}
+
+    service._local_model = _SlowModel()  # type: ignore[attr-defined]
+    clips = [_wav_bytes(16000) + bytes([i]) for i in range(5)]
+
+    await asyncio.gather(*(service.transcribe(clip, filename="clip.wav") for clip in clips))
+
+    assert probe.peak == 1
+
+
+
+@pytest.mark.asyncio
+async def test_batched_and_long_clips_never_share_the_model_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from app.services.whisper_batcher import WhisperBatcher
+
+    service = WhisperService(
+        Settings(
+            enable_local_whisper=True, local_whisper_batch_size=4, local_whisper_batch_wait_ms=1
+        )
+    )
+    probe = _ConcurrencyProbe()
+
+    class _SlowModel:
+        def transcribe(self, audio: Any, **kwargs: Any) -> Dict[str, Any]:
+            probe.enter()
+            return {"text": "long", "segments": []}
+
+    def _decode_batch(self: Any, clips: List[Any], key: Any) -> List[Dict[str, Any]]:
+        probe.enter()
+        return [{"text": "short", "segments": []} for _ in clips]
+
+    async def _loaded() -> None:
+        return None
+
+    monkeypatch.setattr(WhisperBatcher, "_decode_batch", _decode_batch)
+    service._local_model = _SlowModel()  # type: ignore[attr-defined]
+    monkeypatch.setattr(service, "_load_local_model", _loaded)
+    await service.startup()
+    try:
+        long_clip = _wav_bytes(16000, frames=31 * 16000)
+        clips = (long_clip, _wav_bytes(16000), long_clip + b"\0", _wav_bytes(16000, frames=320))
+        results = await asyncio.gather(
+            *(service.transcribe(clip, filename="clip.wav") for clip in clips)
+        )
+    finally:
+        await service.shutdown()
+
+    assert [result.text for result in results] == ["long", "short", "long", "short"]
+    assert probe.peak == 1
+
+
+def test_safetensors_copy_is_written_once_and_reloaded(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    torch = pytest.importorskip("torch")
+    whisper = pytest.importorskip("whisper")
+    pytest.importorskip("safetensors")
+    from app.services import whisper as whisper_module
+
+    dims = whisper.model.ModelDimensions(
+        n_mels=80,
+        n_audio_ctx=8,
+        n_audio_state=16,
+        n_audio_head=2,
+        n_audio_layer=1,
+        n_vocab=32,
+        n_text_ctx=8,
+        n_text_state=16,
+        n_text_head=2,
+        n_text_layer=1,
+    )
+    original = whisper.model.Whisper(dims)
+    loads: List[str] = []
+
+    def _load_model(name: str, device: Any = None) -> Any:
+        loads.append(name)
+        return original
+
+    monkeypatch.setattr(whisper, "load_model", _load_model)
+
+    assert whisper_module._load_whisper_safetensors(tmp_path, "tiny-test") is original
+    reloaded = whisper_module._load_whisper_safetensors(tmp_path, "tiny-test")
+
+    assert loads == ["tiny-test"]
+    assert reloaded is not original and reloaded.dims == dims
+    expected = original.state_dict()
+    for key, value in reloaded.state_dict().items():
+        assert torch.equal(value, expected[key])